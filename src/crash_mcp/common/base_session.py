@@ -2,9 +2,11 @@ import pexpect
 import logging
 import os
 import re
-import uuid
+import shlex
+import secrets
+from collections import deque
 from pathlib import Path
-from typing import List, Optional
+from typing import Deque, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -14,14 +16,27 @@ logger = logging.getLogger(__name__)
 #   \x1b\[[0-9;?]*[a-zA-Z]  - CSI sequences (includes DEC private modes like ?2004l)
 #   \x1b\].*?\x07           - OSC sequences (window titles, etc.)
 ANSI_ESCAPE_PATTERN = re.compile(r'\x1b\[[0-9;?]*[a-zA-Z]|\x1b\].*?\x07')
+# Commands that end the session instead of being sent to the debugger
+_QUIT_CMDS = frozenset({'q', 'quit', 'exit'})
+# One or more complete lines; lets output be consumed before the prompt shows
+_LINES_RE = re.compile(r'(?:[^\n]*\n)+')
 
 class BaseSession:
     """
     Abstract base class for interactive debugger sessions.
     """
-    PROMPT = None  # Must be defined by subclasses
+    PROMPT = None  # Must be defined by subclasses (compiled re.Pattern)
 
     CONFIG_OPTS_PATTERN = None # To be defined by subclasses if needed
+
+    # pexpect tuning: read up to READ_SIZE chars per call (default 2000), and
+    # only regex-scan the trailing SEARCH_WINDOW chars of the buffer for the
+    # prompt instead of rescanning all accumulated output on every read
+    READ_SIZE = 65536
+    SEARCH_WINDOW = 4096
+    # Chars kept at each end of truncatable output while streaming it; well
+    # above the head/tail that _smart_truncate keeps, so results are unchanged
+    STREAM_KEEP_CHARS = 64 * 1024
     
     def __init__(self, dump_path: str, kernel_path: Optional[str] = None, binary_path: str = None, 
                  remote_host: Optional[str] = None, remote_user: Optional[str] = None, ssh_key: Optional[str] = None):
@@ -34,7 +49,7 @@ class BaseSession:
         self.remote_user = remote_user
         self.ssh_key = ssh_key
         
-        self.session_id = str(uuid.uuid4())
+        self.session_id = secrets.token_hex(8)
         self._process = None
         self.history = []
 
@@ -63,7 +78,8 @@ class BaseSession:
 
         # 2. Construct local base command
         args = self.construct_args()
-        cmd_str = f"{self.binary_path} {' '.join(args)}"
+        # Quoted so paths/args with spaces survive the remote shell (and script -c)
+        cmd_str = shlex.join([self.binary_path, *args])
         
         try:
             # 3. Wrap via SSH if remote
@@ -89,7 +105,8 @@ class BaseSession:
                 
                 # For pexpect spawn: binary is ssh, args is list of ssh flags + command
                 # maxread=65536 增大缓冲区以处理长输出 (help, log 等)
-                self._process = pexpect.spawn(ssh_binary, ssh_args, encoding='utf-8', timeout=timeout, maxread=65536)
+                self._process = pexpect.spawn(ssh_binary, ssh_args, encoding='utf-8', timeout=timeout,
+                                              maxread=self.READ_SIZE, searchwindowsize=self.SEARCH_WINDOW)
             else:
                 logger.info(f"Starting LOCAL session: {cmd_str}")
                 
@@ -97,7 +114,7 @@ class BaseSession:
                 env = os.environ.copy()
                 from crash_mcp.config import get_extension_paths
                 
-                ext_paths = get_extension_paths()
+                ext_paths = list(get_extension_paths())
                 
                 if env.get("CRASH_EXTENSIONS"):
                     ext_paths.append(env["CRASH_EXTENSIONS"])
@@ -112,23 +129,20 @@ class BaseSession:
                 # and ensure TTY behavior (line buffering) for interactive tools like prompt.
                 try:
                     from pexpect.popen_spawn import PopenSpawn
-                    import shlex
-                    
-                    # Construct command string for script
-                    real_cmd_list = [self.binary_path] + args
-                    real_cmd_str = shlex.join(real_cmd_list)
                     
-                    # script -q -c "cmd..." /dev/null
+                    # script -q -c "cmd..." /dev/null (cmd_str is already shell-quoted)
                     # Note: script parameters can vary by platform, but -q -c is standard on Linux
-                    wrapper_cmd = ["script", "-q", "-c", real_cmd_str, "/dev/null"]
+                    wrapper_cmd = ["script", "-q", "-c", cmd_str, "/dev/null"]
                     
                     logger.info(f"Spawning via PopenSpawn with script wrapper: {wrapper_cmd}")
-                    self._process = PopenSpawn(wrapper_cmd, encoding='utf-8', timeout=timeout, env=env)
+                    self._process = PopenSpawn(wrapper_cmd, encoding='utf-8', timeout=timeout, env=env,
+                                               maxread=self.READ_SIZE, searchwindowsize=self.SEARCH_WINDOW)
                     
                 except ImportError:
                     logger.warning("PopenSpawn not found, falling back to pexpect.spawn (unsafe in threaded env)")
                     # Remove maxread=65536 which might be causing issues in this environment
-                    self._process = pexpect.spawn(self.binary_path, args, encoding='utf-8', timeout=timeout, env=env)
+                    self._process = pexpect.spawn(self.binary_path, args, encoding='utf-8', timeout=timeout, env=env,
+                                                  searchwindowsize=self.SEARCH_WINDOW)
                     
                 logger.debug(f"Process spawned. PID: {self._process.pid}")
             
@@ -151,7 +165,14 @@ class BaseSession:
         Can be overridden by subclasses.
         """
         if self.PROMPT:
-            self._process.expect(self.PROMPT)
+            self._expect_prompt()
+
+    def _expect_prompt(self, timeout: float = -1) -> int:
+        """Wait for PROMPT via expect_list, skipping expect()'s pattern compilation.
+        
+        timeout=-1 uses the spawn's default, as with expect().
+        """
+        return self._process.expect_list([self.PROMPT], timeout=timeout)
 
     def execute_command(self, command: str, timeout: int = 60, truncate: bool = True) -> str:
         """
@@ -162,8 +183,10 @@ class BaseSession:
 
         logger.debug(f"Executing command: {command}")
         
+        stripped_cmd = command.strip()
+        
         # specific handling for quit/exit to avoid hanging
-        if command.strip() in ['q', 'quit', 'exit']:
+        if stripped_cmd in _QUIT_CMDS:
             self.close()
             return "Session closed"
 
@@ -173,7 +196,7 @@ class BaseSession:
             try:
                 while True:
                     # 尝试读取任何残留数据，超时 0.1 秒
-                    self._process.expect(self.PROMPT, timeout=0.1)
+                    self._expect_prompt(timeout=0.1)
             except pexpect.TIMEOUT:
                 # 没有更多数据，正常
                 pass
@@ -183,36 +206,32 @@ class BaseSession:
             # Send the command
             self._process.sendline(command)
             
-            # Wait for prompt - 使用循环确保读取完整输出
-            output_parts = []
-            while True:
-                try:
-                    index = self._process.expect([self.PROMPT, pexpect.TIMEOUT], timeout=timeout)
-                    output_parts.append(self._process.before)
-                    
-                    if index == 0:
-                        # 匹配到 prompt，命令完成
-                        break
-                    else:
-                        # 超时 - 抛出异常以中断后续操作 (防止死等)
-                        logger.error(f"Command '{command}' timed out (>{timeout}s)")
-                        raise TimeoutError(f"Command '{command}' timed out")
-                except pexpect.EOF:
-                    output_parts.append(self._process.before)
-                    raise RuntimeError("Session closed unexpectedly")
-            
-            raw_output = "".join(output_parts)
+            # Wait for prompt, streaming the output so that with truncate only
+            # its head and tail are held in memory
+            try:
+                raw_output, skipped = self._read_until_prompt(timeout, bounded=truncate)
+            except pexpect.TIMEOUT:
+                # 超时 - 抛出异常以中断后续操作 (防止死等)
+                logger.error(f"Command '{command}' timed out (>{timeout}s)")
+                raise TimeoutError(f"Command '{command}' timed out")
+            except pexpect.EOF:
+                raise RuntimeError("Session closed unexpectedly")
             
             # Clean up the output
-            # 1. Remove the command echo (first line usually)
-            lines = raw_output.splitlines()
-            if lines and command.strip() in lines[0]:
-                lines = lines[1:]
+            # 1. Normalize line endings (\r\n and bare \r, as splitlines did)
+            #    without building a list of every line
+            output = raw_output.replace('\r\n', '\n').replace('\r', '\n')
+            # 2. Remove the command echo (first line usually)
+            newline_idx = output.find('\n')
+            first_line = output if newline_idx < 0 else output[:newline_idx]
+            if output and stripped_cmd in first_line:
+                output = output[newline_idx + 1:] if newline_idx >= 0 else ""
             
-            output = "\n".join(lines).strip()
+            output = output.strip()
             
             # Strip ANSI escape sequences (color codes like \x1b[36m)
-            output = ANSI_ESCAPE_PATTERN.sub('', output)
+            if '\x1b' in output:
+                output = ANSI_ESCAPE_PATTERN.sub('', output)
             
             # [Session History] Track History
             import time
@@ -228,7 +247,7 @@ class BaseSession:
             if not truncate:
                 return output
             
-            return self._smart_truncate(output, command)
+            return self._smart_truncate(output, command, skipped=skipped)
 
         except pexpect.TIMEOUT:
             logger.error(f"Command '{command}' timed out")
@@ -238,10 +257,55 @@ class BaseSession:
             self._process = None
             raise RuntimeError("Session ended unexpectedly")
 
-    def _smart_truncate(self, output: str, command: str) -> str:
+    def _read_until_prompt(self, timeout: int, bounded: bool) -> Tuple[str, int]:
+        """
+        Read output up to the next prompt, consuming it in line blocks so
+        pexpect's buffer stays small.
+        
+        With `bounded`, only the first and last STREAM_KEEP_CHARS are kept once
+        the output grows past 2 * STREAM_KEEP_CHARS; the middle would be cut by
+        _smart_truncate anyway. Returns (output, number of chars dropped),
+        the latter counted after CRLF normalization so it matches the text
+        the caller reports.
+        """
+        import time
+        deadline = time.monotonic() + timeout
+        patterns = [self.PROMPT, _LINES_RE]
+        keep = self.STREAM_KEEP_CHARS
+        head: List[str] = []
+        head_len = 0
+        tail: Deque[str] = deque()
+        tail_len = 0
+        skipped = 0
+        
+        while True:
+            index = self._process.expect_list(patterns, timeout=max(0.0, deadline - time.monotonic()))
+            if index == 0:
+                tail.append(self._process.before)
+                break
+            # With a search window the block may start mid-buffer; keep what precedes it
+            chunk = self._process.before + self._process.after
+            if not bounded or head_len < keep:
+                head.append(chunk)
+                head_len += len(chunk)
+                continue
+            tail.append(chunk)
+            tail_len += len(chunk)
+            # Drop whole chunks from the middle while the tail stays >= keep
+            while tail_len - len(tail[0]) >= keep:
+                dropped = tail.popleft()
+                tail_len -= len(dropped)
+                skipped += len(dropped) - dropped.count('\r\n')
+        
+        if skipped:
+            logger.debug(f"Dropped {skipped} chars from the middle of the output")
+        return "".join(head) + "".join(tail), skipped
+
+    def _smart_truncate(self, output: str, command: str, skipped: int = 0) -> str:
         """
         Applies smart truncation to the output.
         Can be overridden or enhanced by subclasses for specific command logic.
+        `skipped` counts chars already dropped from the middle while reading.
         """
         # Default limit: 16KB (approx 4k tokens, safe buffer)
         MAX_LEN = 16384 
@@ -249,18 +313,19 @@ class BaseSession:
         if len(output) <= MAX_LEN:
             return output
             
-        removed_chars = len(output) - MAX_LEN
-        logger.warning(f"Output truncated. Original length: {len(output)}. Removed {removed_chars} chars.")
+        removed_chars = len(output) - MAX_LEN + skipped
+        logger.warning(f"Output truncated. Original length: {len(output) + skipped}. Removed {removed_chars} chars.")
         
         # Default Head+Tail Strategy
         HEAD_LEN = 4096
         TAIL_LEN = MAX_LEN - HEAD_LEN # 12288
         
-        return (
-            output[:HEAD_LEN] + 
-            f"\\n\\n... [Output truncated by Crash MCP ({removed_chars} characters skipped). Use specific commands to view more.] ...\\n\\n" + 
-            output[-TAIL_LEN:]
-        )
+        # Single join instead of chained '+' so only the final string is allocated
+        return "".join((
+            output[:HEAD_LEN],
+            f"\\n\\n... [Output truncated by Crash MCP ({removed_chars} characters skipped). Use specific commands to view more.] ...\\n\\n",
+            output[-TAIL_LEN:],
+        ))
 
     def close(self):
         """
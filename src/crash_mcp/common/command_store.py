@@ -1,15 +1,57 @@
 """Command output persistence and retrieval."""
 import re
+import sys
 import time
 import json
+import atexit
+import weakref
 import hashlib
 import logging
+import functools
 from pathlib import Path
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Write buffer for output files (fewer write syscalls for large outputs)
+OUTPUT_WRITE_BUFFER = 128 * 1024
+
+# Search results kept per store; repeated searches of unchanged output reuse them
+SEARCH_CACHE_SIZE = 64
+
+# Saved outputs up to this size keep their split lines between calls, so
+# paging through the same output does not re-read and re-split the file
+LINES_CACHE_MAX_BYTES = 16 * 1024 * 1024
+
+# Bump when the command_id scheme changes. Older manifests are migrated on
+# load: context-free entries are re-keyed, context-dependent ones (whose
+# context is not recorded) are dropped.
+MANIFEST_VERSION = 2
+
+
+# Every live store, so pending manifest writes survive sessions that are
+# dropped without close() (dead engines, interpreter exit)
+_LIVE_STORES: "weakref.WeakSet[CommandStore]" = weakref.WeakSet()
+
+
+def _flush_all_stores():
+    """Write any pending manifest of every live store (registered with atexit)."""
+    for store in list(_LIVE_STORES):
+        try:
+            store.flush()
+        except Exception as e:
+            logger.warning(f"Failed to flush manifest in {store.workdir}: {e}")
+
+
+atexit.register(_flush_all_stores)
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_query(query: str) -> "re.Pattern":
+    return re.compile(query, re.IGNORECASE)
+
 
 @dataclass
 class CommandResult:
@@ -33,9 +75,20 @@ class CommandStore:
         self.workdir = Path(workdir)
         self.workdir.mkdir(parents=True, exist_ok=True)
         self._commands: Dict[str, CommandResult] = {}  # command_id -> result
+        # LRU of memory-held outputs: command_id -> approx size in bytes
+        self._memory_lru: "OrderedDict[str, int]" = OrderedDict()
+        self._memory_bytes = 0
         self._index = 0
         self._manifest_file = self.workdir / "manifest.json"
+        # Manifest rewrites are batched: save() marks it dirty, flush() writes it
+        self._manifest_dirty = False
+        self._manifest_written_at = 0.0
+        # (command_id, query, context_lines, timestamp) -> matches
+        self._search_cache: "OrderedDict[tuple, List[Dict]]" = OrderedDict()
+        # ((path, st_mtime_ns, st_size), lines) of the last file read
+        self._file_lines: Optional[Tuple[tuple, List[str]]] = None
         self._load_manifest()
+        _LIVE_STORES.add(self)
         logger.debug(f"CommandStore initialized at {self.workdir}")
     
     def save(self, engine: str, command: str, output: str, 
@@ -72,7 +125,7 @@ class CommandStore:
                     existing.output_file = self._generate_path(engine, command)
                 
                 try:
-                    existing.output_file.write_text(output)
+                    self._write_output(existing.output_file, output)
                     existing.output_content = None # Clear memory if saved to file
                 except IOError as e:
                      logger.error(f"Failed to write output file: {e}")
@@ -94,10 +147,11 @@ class CommandStore:
             existing.duration = duration
             existing.cached = False
             existing.is_error = is_error
+            self._track_memory(command_id, existing.output_content)
             
             if existing.output_file:
                 logger.debug(f"Updated command output file: {command_id} -> {existing.output_file}")
-                self._save_manifest()
+                self._mark_manifest_dirty()
             
             return existing
         
@@ -108,7 +162,7 @@ class CommandStore:
         if should_save:
             output_file = self._generate_path(engine, command)
             try:
-                output_file.write_text(output)
+                self._write_output(output_file, output)
             except IOError as e:
                 logger.error(f"Failed to write output file: {e}")
                 # Fallback
@@ -130,13 +184,64 @@ class CommandStore:
             is_error=is_error,
         )
         self._commands[command_id] = result
+        self._track_memory(command_id, output_content)
         if output_file:
             logger.debug(f"Saved command output to file: {command_id} -> {output_file}")
-            self._save_manifest()
+            self._mark_manifest_dirty()
         else:
             logger.debug(f"Saved command output to memory: {command_id}")
         return result
 
+    def flush(self):
+        """Write the manifest if any persisted entry changed since the last write."""
+        if not self._manifest_dirty:
+            return
+        self._save_manifest()
+        self._manifest_dirty = False
+        self._manifest_written_at = time.monotonic()
+
+    def _mark_manifest_dirty(self):
+        """Defer manifest rewrites; flush at most once per COMMAND_MANIFEST_FLUSH_SECONDS."""
+        from crash_mcp.config import Config
+        self._manifest_dirty = True
+        if time.monotonic() - self._manifest_written_at >= Config.COMMAND_MANIFEST_FLUSH_SECONDS:
+            self.flush()
+
+    def _track_memory(self, command_id: str, content: Optional[str]):
+        """Record (or drop) a memory-held output in the LRU, then enforce bounds."""
+        self._memory_bytes -= self._memory_lru.pop(command_id, 0)
+        if content is not None:
+            size = sys.getsizeof(content)
+            self._memory_lru[command_id] = size
+            self._memory_bytes += size
+        self._evict_memory()
+
+    def _evict_memory(self):
+        """Drop least recently used memory-only results beyond the configured caps."""
+        from crash_mcp.config import Config
+        while self._memory_lru and (
+            len(self._memory_lru) > Config.COMMAND_CACHE_MAX_ENTRIES or
+            self._memory_bytes > Config.COMMAND_CACHE_MAX_BYTES
+        ):
+            cid, size = self._memory_lru.popitem(last=False)
+            self._memory_bytes -= size
+            result = self._commands.get(cid)
+            if result is None:
+                continue
+            if result.output_file:
+                # File-backed: only release the in-memory copy
+                result.output_content = None
+            else:
+                del self._commands[cid]
+            logger.debug(f"Evicted cached output: {cid}")
+
+    def _write_output(self, path: Path, output: str):
+        """Write command output through a large buffer."""
+        # Don't rely on mtime alone (coarse on some filesystems)
+        self._file_lines = None
+        with open(path, "w", buffering=OUTPUT_WRITE_BUFFER) as f:
+            f.write(output)
+
     def _generate_path(self, engine: str, command: str) -> Path:
         """Generate unique filename."""
         self._index += 1
@@ -150,6 +255,8 @@ class CommandStore:
         command_id = self._make_id(engine, command, context)
         result = self._commands.get(command_id)
         if result and not result.is_error:
+            if command_id in self._memory_lru:
+                self._memory_lru.move_to_end(command_id)
             result.cached = True
             logger.debug(f"Cache hit: {command_id}")
             return result
@@ -159,6 +266,17 @@ class CommandStore:
         """Get command result by ID."""
         return self._commands.get(command_id)
     
+    def _read_file_lines(self, path: Path) -> List[str]:
+        """splitlines() of a saved output, reusing the last file's lines if unchanged."""
+        st = path.stat()
+        key = (str(path), st.st_mtime_ns, st.st_size)
+        cached = self._file_lines
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        lines = path.read_text().splitlines()
+        self._file_lines = (key, lines) if st.st_size <= LINES_CACHE_MAX_BYTES else None
+        return lines
+    
     def get_lines(self, command_id: str, offset: int, limit: int) -> Tuple[str, int, int, bool]:
         """Read lines [offset:offset+limit]. 
         
@@ -170,7 +288,7 @@ class CommandStore:
         
         try:
             if result.output_file and result.output_file.exists():
-                lines = result.output_file.read_text().splitlines()
+                lines = self._read_file_lines(result.output_file)
             elif result.output_content is not None:
                 lines = result.output_content.splitlines()
             else:
@@ -194,9 +312,21 @@ class CommandStore:
         if not result:
             raise ValueError(f"Command not found: {command_id}")
         
+        try:
+            pattern = _compile_query(query)
+        except re.error as e:
+            raise ValueError(f"Invalid regex pattern: {e}")
+        
+        # save() bumps the timestamp whenever the output is rewritten
+        cache_key = (command_id, query, context_lines, result.timestamp)
+        cached = self._search_cache.get(cache_key)
+        if cached is not None:
+            self._search_cache.move_to_end(cache_key)
+            return cached
+        
         try:
             if result.output_file and result.output_file.exists():
-                lines = result.output_file.read_text().splitlines()
+                lines = self._read_file_lines(result.output_file)
             elif result.output_content is not None:
                 lines = result.output_content.splitlines()
             else:
@@ -205,11 +335,6 @@ class CommandStore:
             logger.error(f"Failed to read output file: {e}")
             raise ValueError(f"Failed to read output: {e}")
         
-        try:
-            pattern = re.compile(query, re.IGNORECASE)
-        except re.error as e:
-            raise ValueError(f"Invalid regex pattern: {e}")
-        
         matches = []
         limit = 20  # Hard limit to prevent context explosion
         
@@ -232,23 +357,37 @@ class CommandStore:
                     break
         
         logger.debug(f"Search '{query}' in {command_id}: {len(matches)} matches (limit: {limit})")
+        self._search_cache[cache_key] = matches
+        if len(self._search_cache) > SEARCH_CACHE_SIZE:
+            self._search_cache.popitem(last=False)
         return matches
     
     def _make_id(self, engine: str, command: str, context: Dict[str, str]) -> str:
-        """Generate unique command_id using hash.
+        """Generate unique command_id from a content hash of the normalized inputs.
         
-        Format: "engine:cmd_prefix:hash[:context_hash]"
+        Format: "engine:cmd_prefix:hash[@context_hash]"
         """
-        cmd = command.strip()
-        cmd_prefix = cmd.split()[0][:10] if cmd.split() else "cmd"
-        cmd_hash = hashlib.md5(cmd.encode()).hexdigest()[:8]
+        cmd = self._normalize_command(engine, command)
+        words = cmd.split(None, 1)
+        cmd_prefix = words[0][:10] if words else "cmd"
+        cmd_hash = hashlib.blake2b(f"{engine}\0{cmd}".encode(), digest_size=8).hexdigest()
         
         if context:
-            ctx_str = ",".join(f"{k}={v}" for k, v in sorted(context.items()))
-            ctx_hash = hashlib.md5(ctx_str.encode()).hexdigest()[:6]
+            ctx_str = json.dumps(context, sort_keys=True)
+            ctx_hash = hashlib.blake2b(ctx_str.encode(), digest_size=4).hexdigest()
             return f"{engine}:{cmd_prefix}:{cmd_hash}@{ctx_hash}"
         return f"{engine}:{cmd_prefix}:{cmd_hash}"
     
+    @staticmethod
+    def _normalize_command(engine: str, command: str) -> str:
+        """Canonical form of a command for cache keys."""
+        cmd = command.strip()
+        if engine == "crash":
+            # crash tokenizes on whitespace, so runs of blanks are insignificant.
+            # drgn/pykdump are Python, where whitespace may be meaningful.
+            cmd = " ".join(cmd.split())
+        return cmd
+    
     def _sanitize(self, s: str) -> str:
         """Sanitize string for filename use."""
         return re.sub(r'[^a-zA-Z0-9_-]', '_', s)[:20]
@@ -260,6 +399,9 @@ class CommandStore:
             
         try:
             data = json.loads(self._manifest_file.read_text())
+            migrate = data.get('version') != MANIFEST_VERSION
+            if not migrate:
+                data = data.get('entries', {})
             for cid, info in data.items():
                 # Reconstruct CommandResult
                 output_file = self.workdir / info['output_file'] if info.get('output_file') else None
@@ -276,6 +418,14 @@ class CommandStore:
                 if not cmd_str or not engine_str:
                     logger.warning(f"Skipping malformed manifest entry {cid}: missing command or engine")
                     continue
+                
+                if migrate:
+                    self._manifest_dirty = True
+                    if '@' in cid:
+                        # The context behind the old id is not recorded
+                        logger.info(f"Dropping context-dependent entry {cid} from old manifest")
+                        continue
+                    cid = self._make_id(engine_str, cmd_str, {})
 
                 self._commands[cid] = CommandResult(
                     command_id=cid,
@@ -320,6 +470,6 @@ class CommandStore:
                 }
         
         try:
-            self._manifest_file.write_text(json.dumps(data, indent=2))
+            self._manifest_file.write_text(json.dumps({"version": MANIFEST_VERSION, "entries": data}, indent=2))
         except IOError as e:
             logger.error(f"Failed to write manifest: {e}")
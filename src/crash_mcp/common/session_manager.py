@@ -1,7 +1,8 @@
 """Session lifecycle and deduplication management."""
 import hashlib
-import uuid
+import secrets
 import logging
+import threading
 from pathlib import Path
 from typing import Dict, Optional, Tuple
 from dataclasses import dataclass, field
@@ -24,7 +25,11 @@ class SessionInfo:
 
 
 class SessionManager:
-    """Manages session lifecycle with deduplication by vmcore MD5."""
+    """Manages session lifecycle with deduplication by vmcore MD5.
+    
+    Tools may run concurrently, so the maps and ref counts are only touched
+    under one lock.
+    """
     
     # Crash commands that depend on context
     CONTEXT_DEPENDENT_COMMANDS = {"bt", "task", "vm", "vtop", "ptov", "rd", "wr"}
@@ -38,61 +43,71 @@ class SessionManager:
         
         self._sessions: Dict[str, SessionInfo] = {}     # session_id -> info
         self._vmcore_map: Dict[str, str] = {}           # vmcore_md5 -> session_id
+        self._lock = threading.RLock()
         
         logger.info(f"SessionManager initialized with workdir: {self._base_workdir}")
         
     def get_or_create(self, vmcore_path: str, vmlinux_path: str = None) -> Tuple[str, SessionInfo, bool]:
         """Return (session_id, info, is_new). Dedup by vmcore MD5."""
+        # Hash outside the lock; it reads up to 64MB of the dump
         vmcore_md5 = self._compute_md5(vmcore_path)
         
-        # Check if session already exists for this vmcore
-        if vmcore_md5 in self._vmcore_map:
-            sid = self._vmcore_map[vmcore_md5]
-            logger.info(f"Reusing existing session {sid} for vmcore MD5 {vmcore_md5}")
-            return sid, self._sessions[sid], False
-        
-        # Create new session
-        sid = str(uuid.uuid4())
-        workdir = self._base_workdir / vmcore_md5
-        workdir.mkdir(parents=True, exist_ok=True)
-        
-        info = SessionInfo(
-            session_id=sid,
-            vmcore_md5=vmcore_md5,
-            vmcore_path=vmcore_path,
-            vmlinux_path=vmlinux_path or "",
-            workdir=workdir,
-            context={},
-            ref_count=0,
-        )
-        self._sessions[sid] = info
-        self._vmcore_map[vmcore_md5] = sid
+        with self._lock:
+            # Check if session already exists for this vmcore
+            if vmcore_md5 in self._vmcore_map:
+                sid = self._vmcore_map[vmcore_md5]
+                logger.info(f"Reusing existing session {sid} for vmcore MD5 {vmcore_md5}")
+                return sid, self._sessions[sid], False
+            
+            # Create new session
+            # Opaque dict key; 16 hex chars is plenty and cheaper than a UUID string
+            sid = secrets.token_hex(8)
+            workdir = self._base_workdir / vmcore_md5
+            workdir.mkdir(parents=True, exist_ok=True)
+            
+            info = SessionInfo(
+                session_id=sid,
+                vmcore_md5=vmcore_md5,
+                vmcore_path=vmcore_path,
+                vmlinux_path=vmlinux_path or "",
+                workdir=workdir,
+                context={},
+                ref_count=0,
+            )
+            self._sessions[sid] = info
+            self._vmcore_map[vmcore_md5] = sid
         
         logger.info(f"Created new session {sid} for vmcore MD5 {vmcore_md5}, workdir: {workdir}")
         return sid, info, True
     
     def acquire(self, session_id: str) -> bool:
         """Increment reference count. Returns True if session exists."""
-        if session_id in self._sessions:
-            self._sessions[session_id].ref_count += 1
-            logger.debug(f"Session {session_id} acquired, ref_count={self._sessions[session_id].ref_count}")
-            return True
-        return False
+        with self._lock:
+            if session_id in self._sessions:
+                self._sessions[session_id].ref_count += 1
+                logger.debug(f"Session {session_id} acquired, ref_count={self._sessions[session_id].ref_count}")
+                return True
+            return False
     
     def release(self, session_id: str) -> int:
-        """Decrement reference count. Returns new count (-1 if not found)."""
-        if session_id not in self._sessions:
-            return -1
-        self._sessions[session_id].ref_count -= 1
-        count = self._sessions[session_id].ref_count
+        """Decrement reference count, never below 0. Returns new count (-1 if not found)."""
+        with self._lock:
+            if session_id not in self._sessions:
+                return -1
+            info = self._sessions[session_id]
+            # An entry that was never acquired (e.g. its start failed) stays at 0
+            # so close_vmcore_session can still tear it down
+            if info.ref_count > 0:
+                info.ref_count -= 1
+            count = info.ref_count
         logger.debug(f"Session {session_id} released, ref_count={count}")
         return count
     
     def get_ref_count(self, session_id: str) -> int:
         """Get current reference count."""
-        if session_id in self._sessions:
-            return self._sessions[session_id].ref_count
-        return 0
+        with self._lock:
+            info = self._sessions.get(session_id)
+            return info.ref_count if info else 0
     
     def get_session(self, session_id: str) -> Optional[SessionInfo]:
         """Get session info by ID."""
@@ -100,16 +115,18 @@ class SessionManager:
     
     def update_context(self, session_id: str, key: str, value: str):
         """Update session context (e.g., after 'set pid 1234')."""
-        if session_id in self._sessions:
-            self._sessions[session_id].context[key] = value
-            logger.debug(f"Session {session_id} context updated: {key}={value}")
+        with self._lock:
+            info = self._sessions.get(session_id)
+            if info is None:
+                return
+            info.context[key] = value
+        logger.debug(f"Session {session_id} context updated: {key}={value}")
     
     def get_context(self, session_id: str) -> Dict[str, str]:
         """Get current session context."""
-        info = self._sessions.get(session_id)
-        if info:
-            return info.context.copy()
-        return {}
+        with self._lock:
+            info = self._sessions.get(session_id)
+            return info.context.copy() if info else {}
     
     def get_relevant_context(self, session_id: str, command: str) -> Dict[str, str]:
         """Get context relevant to a command (for command_id generation).
@@ -135,11 +152,12 @@ class SessionManager:
     
     def remove_session(self, session_id: str):
         """Remove session from registry."""
-        if session_id in self._sessions:
-            info = self._sessions[session_id]
+        with self._lock:
+            info = self._sessions.pop(session_id, None)
+            if info is None:
+                return
             del self._vmcore_map[info.vmcore_md5]
-            del self._sessions[session_id]
-            logger.info(f"Removed session {session_id}")
+        logger.info(f"Removed session {session_id}")
     
     def _compute_md5(self, path: str) -> str:
         """Compute vmcore MD5 (first 64MB for speed)."""
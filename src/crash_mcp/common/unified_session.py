@@ -1,10 +1,11 @@
 import logging
-import uuid
+import time
+import queue
+import secrets
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, Dict, Tuple
 
-from crash_mcp.crash.session import CrashSession
-from crash_mcp.drgn.session import DrgnSession
 from crash_mcp.common.command_store import CommandStore, CommandResult
 from crash_mcp.config import Config
 
@@ -17,12 +18,32 @@ class UnifiedSession:
     Enhanced with workdir, context tracking, and persistent command storage.
     """
     
+    __slots__ = (
+        'dump_path', 'kernel_path', 'remote_host', 'remote_user', 'crash_args',
+        'workdir', 'context', 'command_store', 'crash_session', 'drgn_session',
+        'id', 'drgn_start_error', 'crash_start_error', '_engine_dispatch',
+        '_active_cache',
+    )
+    
     # Commands that depend on context (pid, cpu)
     CONTEXT_DEPENDENT_COMMANDS = {"bt", "task", "vm", "vtop", "ptov", "rd", "wr"}
     
     # Context keys that can be set
     CONTEXT_KEYS = {"pid", "cpu", "context"}
     
+    # Explicit routing prefixes: (prefix, prefix length, handler method name)
+    _PREFIXES = (("drgn:", 5, "drgn"), ("crash:", 6, "crash"), ("pykdump:", 8, "pykdump"))
+    _PREFIX_STRS = tuple(p for p, _, _ in _PREFIXES)
+    
+    # Heuristic routing tables
+    _CRASH_CMDS = frozenset(['sys', 'bt', 'ps', 'log', 'mount', 'net', 'dev', 'files', 'help', 'set', 'extend'])
+    _DRGN_FIRST = frozenset(['prog', 'task', 'thread'])
+    _DRGN_CHARS = frozenset('=(.[')
+    
+    # How long an is_active() result is reused (seconds); spares subprocess
+    # polling when tools check liveness on every call
+    ACTIVE_CACHE_TTL = 0.5
+    
     def __init__(self, dump_path: str, kernel_path: str = None, 
                  remote_host: str = None, remote_user: str = None,
                  crash_args: list = None, workdir: Path = None):
@@ -37,16 +58,24 @@ class UnifiedSession:
         self.context: Dict[str, str] = {}
         self.command_store = CommandStore(self.workdir) if self.workdir else None
         
-        # Initialize sub-sessions
+        # Initialize sub-sessions (imported lazily so that importing this
+        # module, e.g. for tool registration, does not load both engines)
+        from crash_mcp.crash.session import CrashSession
+        from crash_mcp.drgn.session import DrgnSession
         self.crash_session = CrashSession(dump_path, kernel_path, 
                                         remote_host=remote_host, remote_user=remote_user,
                                         crash_args=self.crash_args)
         self.drgn_session = DrgnSession(dump_path, kernel_path, 
                                         remote_host=remote_host, remote_user=remote_user)
         
-        self.id = str(uuid.uuid4())
+        self.id = secrets.token_hex(8)
         self.drgn_start_error = None
         self.crash_start_error = None
+        
+        # engine name -> executor; rebuilt by start() once engines are up
+        self._build_dispatch()
+        # (monotonic timestamp, result) of the last is_active() probe
+        self._active_cache: Optional[Tuple[float, bool]] = None
 
     from typing import Callable
 
@@ -63,12 +92,19 @@ class UnifiedSession:
         def make_sub_progress(range_start, range_end):
             if not on_progress:
                 return None
-            def sub_cb(p, msg):
-                # Map p (0-100) to range
-                scaled = range_start + (p / 100.0) * (range_end - range_start)
-                # We can optionally prefix the message
-                on_progress(scaled, msg)
-            return sub_cb
+            # Map p (0-100) to range; the scale factor is computed once
+            scale = (range_end - range_start) * 0.01
+            cb = on_progress
+            return lambda p, msg: cb(range_start + p * scale, msg)
+        
+        # Drgn does not depend on crash, so bring it up on a worker thread
+        # while crash starts here. Progress callbacks stay on this thread:
+        # drgn's progress is queued and replayed (50-90%) once crash is up.
+        drgn_progress: "queue.Queue[Tuple[float, str]]" = queue.Queue()
+        drgn_cb = (lambda p, msg: drgn_progress.put((p, msg))) if on_progress else None
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="drgn-start")
+        drgn_future = executor.submit(lambda: self.drgn_session.start(timeout=timeout, on_progress=drgn_cb))
+        executor.shutdown(wait=False)
         
         # Start Crash (0-50%)
         try:
@@ -91,11 +127,21 @@ class UnifiedSession:
             self.crash_session = None
             self.crash_start_error = str(e)
             
-        # Start Drgn (50-100%)
+        # Drgn (50-100%), started above
         try:
-            report(50, "Starting Drgn engine...")
+            report(50, "Waiting for Drgn engine...")
             cb = make_sub_progress(50, 90)
-            self.drgn_session.start(timeout=timeout, on_progress=cb)
+            if cb:
+                # Forward drgn's progress while waiting; drain what is left once it is done
+                while True:
+                    try:
+                        cb(*drgn_progress.get(timeout=0.1))
+                    except queue.Empty:
+                        if drgn_future.done():
+                            break
+                while not drgn_progress.empty():
+                    cb(*drgn_progress.get_nowait())
+            drgn_future.result()
             logger.info("Drgn engine started.")
             self.drgn_start_error = None
             report(90, "Drgn engine ready")
@@ -106,6 +152,9 @@ class UnifiedSession:
             
         if self.crash_session is None and self.drgn_session is None:
             raise RuntimeError("Both engines failed to start.")
+        
+        self._active_cache = None
+        self._build_dispatch()
             
         report(100, "Session initialization complete")
 
@@ -114,31 +163,23 @@ class UnifiedSession:
         cmd = command.strip()
         
         # Explicit routing prefix
-        if cmd.startswith("drgn:"):
-            return self._exec_drgn(cmd[5:].strip(), timeout, truncate)
-        elif cmd.startswith("crash:"):
-            return self._exec_crash(cmd[6:].strip(), timeout, truncate)
-        elif cmd.startswith("pykdump:"):
-            return self._exec_pykdump(cmd[8:].strip(), timeout, truncate)
+        if cmd.startswith(self._PREFIX_STRS):
+            for prefix, length, engine in self._PREFIXES:
+                if cmd.startswith(prefix):
+                    return self._engine_dispatch[engine](cmd[length:].strip(), timeout, truncate)
             
         # Heuristic Routing
-        is_drgn = False
-        crash_cmds = ['sys', 'bt', 'ps', 'log', 'mount', 'net', 'dev', 'files', 'help', 'set', 'extend']
-        first_word = cmd.split()[0] if cmd else ""
+        first_word = cmd.split(None, 1)[0] if cmd else ""
         
-        if first_word in crash_cmds:
+        if first_word in self._CRASH_CMDS:
             is_drgn = False
-        elif any(x in cmd for x in ['=', '(', '.', '[']):
-            is_drgn = True
-        elif first_word in ['prog', 'task', 'thread']:
+        elif not self._DRGN_CHARS.isdisjoint(cmd):
+            # Single C-level pass over the command for any python-ish character
             is_drgn = True
         else:
-            is_drgn = False
+            is_drgn = first_word in self._DRGN_FIRST
             
-        if is_drgn:
-            return self._exec_drgn(cmd, timeout, truncate)
-        else:
-            return self._exec_crash(cmd, timeout, truncate)
+        return self._engine_dispatch["drgn" if is_drgn else "crash"](cmd, timeout, truncate)
 
     def execute_with_store(self, command: str, timeout: int = 60, 
                            force: bool = False) -> CommandResult:
@@ -172,9 +213,8 @@ class UnifiedSession:
                     return cached
         
         # Execute command (no truncation - we'll handle that in the tool layer)
-        import time
         start_time = time.time()
-        output = self.execute_command(f"{engine}:{cmd}", timeout=timeout, truncate=False)
+        output = self._engine_dispatch[engine](cmd, timeout, False)
         duration = time.time() - start_time
         
         # Detect if output is an error (should not be cached)
@@ -214,8 +254,9 @@ class UnifiedSession:
 
     def _get_relevant_context(self, cmd: str) -> Dict[str, str]:
         """Get context relevant to a command (for command_id generation)."""
-        cmd_word = cmd.strip().split()[0] if cmd.strip() else ""
-        if cmd_word in self.CONTEXT_DEPENDENT_COMMANDS:
+        # Only the first word matters; stop splitting after it
+        words = cmd.split(None, 1)
+        if words and words[0] in self.CONTEXT_DEPENDENT_COMMANDS:
             return self.context.copy()
         return {}
 
@@ -223,7 +264,8 @@ class UnifiedSession:
         """Parse 'set pid/cpu' commands to update context."""
         if engine != "crash":
             return
-        parts = cmd.strip().split()
+        # 'set <key> <value>' needs at most three tokens
+        parts = cmd.split(None, 3)
         if len(parts) >= 3 and parts[0] == "set":
             key = parts[1]
             value = parts[2]
@@ -231,25 +273,51 @@ class UnifiedSession:
                 self.context[key] = value
                 logger.debug(f"Context updated: {key}={value}")
 
-    def _exec_drgn(self, cmd: str, timeout: int, truncate: bool) -> str:
-        if not self.drgn_session or not self.drgn_session.is_active():
-            error_msg = self.drgn_start_error
-            return f"Error: Drgn engine is not active. (Reason: {error_msg})" if error_msg else "Error: Drgn engine is not active."
-        return self.drgn_session.execute_command(cmd, timeout, truncate)
-
-    def _exec_crash(self, cmd: str, timeout: int, truncate: bool) -> str:
-        if not self.crash_session or not self.crash_session.is_active():
-            error_msg = self.crash_start_error
-            return f"Error: Crash engine is not active. (Reason: {error_msg})" if error_msg else "Error: Crash engine is not active."
-        return self.crash_session.execute_command(cmd, timeout, truncate)
-
-    def _exec_pykdump(self, code: str, timeout: int, truncate: bool) -> str:
-        """Execute pykdump Python code via crash session."""
-        if not self.crash_session or not self.crash_session.is_active():
-            return "Error: Crash engine is not active."
-        return self.crash_session.run_pykdump(code, is_file=False, timeout=timeout, truncate=truncate)
+    def _build_dispatch(self):
+        """Build the per-engine executors (the only place they are defined).
+        
+        The closures bind the sub-session directly, so a command no longer
+        re-checks `self.crash_session`/`self.drgn_session` for None. The
+        is_active() probe stays: an engine can die after start().
+        """
+        def inactive(name, reason):
+            msg = f"Error: {name} engine is not active. (Reason: {reason})" if reason else f"Error: {name} engine is not active."
+            return lambda *_: msg
+        
+        crash, drgn = self.crash_session, self.drgn_session
+        if crash:
+            crash_down = inactive("Crash", self.crash_start_error)
+            pykdump_down = inactive("Crash", None)
+            
+            def exec_crash(cmd, timeout, truncate):
+                if not crash.is_active():
+                    return crash_down()
+                return crash.execute_command(cmd, timeout, truncate)
+            
+            def exec_pykdump(code, timeout, truncate):
+                if not crash.is_active():
+                    return pykdump_down()
+                return crash.run_pykdump(code, is_file=False, timeout=timeout, truncate=truncate)
+        else:
+            exec_crash = inactive("Crash", self.crash_start_error)
+            exec_pykdump = inactive("Crash", None)
+        
+        if drgn:
+            drgn_down = inactive("Drgn", self.drgn_start_error)
+            
+            def exec_drgn(cmd, timeout, truncate):
+                if not drgn.is_active():
+                    return drgn_down()
+                return drgn.execute_command(cmd, timeout, truncate)
+        else:
+            exec_drgn = inactive("Drgn", self.drgn_start_error)
+        
+        self._engine_dispatch = {"crash": exec_crash, "drgn": exec_drgn, "pykdump": exec_pykdump}
 
     def close(self):
+        self._active_cache = None
+        if self.command_store:
+            self.command_store.flush()
         if self.crash_session:
             self.crash_session.close()
         if self.drgn_session:
@@ -260,5 +328,11 @@ class UnifiedSession:
         self.close()
             
     def is_active(self) -> bool:
-        return (self.crash_session and self.crash_session.is_active()) or \
-               (self.drgn_session and self.drgn_session.is_active())
+        now = time.monotonic()
+        cached = self._active_cache
+        if cached is not None and now - cached[0] < self.ACTIVE_CACHE_TTL:
+            return cached[1]
+        active = bool((self.crash_session and self.crash_session.is_active()) or
+                      (self.drgn_session and self.drgn_session.is_active()))
+        self._active_cache = (now, active)
+        return active
@@ -1,6 +1,10 @@
 import os
-import glob
-from typing import List, Optional, Dict
+import re
+import fnmatch
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Dict, Set, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
@@ -9,11 +13,137 @@ logger = logging.getLogger(__name__)
 DUMP_PATTERNS = ["vmcore*", "core.*", "*.dump", "crash.*"]
 # Common kernel image names
 KERNEL_PATTERNS = ["vmlinux*", "System.map*"]
+KERNEL_PREFIXES = tuple(p.rstrip("*") for p in KERNEL_PATTERNS)
 
 # Files to ignore even if they match DUMP_PATTERNS
 IGNORE_EXTENSIONS = [".txt", ".log", ".gz", ".tar"]
 IGNORE_PATTERNS = ["dmesg", "readme", "log"]
 
+# All DUMP_PATTERNS folded into one regex so each name is tested in one match
+COMPILED_DUMPS = re.compile("|".join(fnmatch.translate(p) for p in DUMP_PATTERNS))
+# IGNORE_PATTERNS are substring matches (not globs), so escape rather than translate
+COMPILED_IGNORE = re.compile("|".join(re.escape(p) for p in IGNORE_PATTERNS))
+IGNORE_SUFFIXES = tuple(IGNORE_EXTENSIONS)
+
+# Candidate count from which find_dumps stats files concurrently
+STAT_PARALLEL_MIN = 16
+STAT_WORKERS = 16
+
+# Parsed header cache: (kind, (realpath, st_mtime_ns, st_size), ...) -> result
+# Bounded LRU; entries self-invalidate when a file's mtime or size changes.
+_DUMP_INFO_CACHE_MAX = 64
+_DUMP_INFO_CACHE: "OrderedDict[tuple, object]" = OrderedDict()
+_DUMP_INFO_LOCK = threading.Lock()
+
+# Directories where match_kernel found nothing: dir -> st_mtime_ns at the time.
+# Adding a kernel image changes the dir's mtime, which invalidates the entry.
+# Bounded LRU like _DUMP_INFO_CACHE; match_kernel runs on worker threads.
+_NO_KERNEL_DIRS_MAX = 64
+_NO_KERNEL_DIRS: "OrderedDict[str, int]" = OrderedDict()
+_NO_KERNEL_LOCK = threading.Lock()
+
+
+def _file_key(path: str) -> Tuple[str, int, int]:
+    st = os.stat(path)
+    return (os.path.realpath(path), st.st_mtime_ns, st.st_size)
+
+
+def _cached_parse(kind: str, paths: Tuple[str, ...], compute):
+    """Return compute() memoized on the identity (path, mtime, size) of `paths`."""
+    try:
+        key = (kind,) + tuple(_file_key(p) for p in paths)
+    except OSError:
+        # Unreadable/missing file: let the parser report the error as before
+        return compute()
+
+    with _DUMP_INFO_LOCK:
+        if key in _DUMP_INFO_CACHE:
+            _DUMP_INFO_CACHE.move_to_end(key)
+            return _DUMP_INFO_CACHE[key]
+
+    result = compute()
+
+    with _DUMP_INFO_LOCK:
+        _DUMP_INFO_CACHE[key] = result
+        _DUMP_INFO_CACHE.move_to_end(key)
+        while len(_DUMP_INFO_CACHE) > _DUMP_INFO_CACHE_MAX:
+            _DUMP_INFO_CACHE.popitem(last=False)
+    return result
+
+
+def _safe_stat(entry: os.DirEntry) -> Optional[os.stat_result]:
+    try:
+        return entry.stat()
+    except OSError:
+        return None
+
+
+def _scan_path(root: str) -> List[Tuple[Tuple[int, int], Dict[str, str]]]:
+    """
+    Walk `root` once with os.scandir, evaluating all DUMP_PATTERNS per entry.
+    Name checks run before stat() so non-matching files cost no extra syscall.
+    Returns (st_dev, st_ino) keyed entries so the caller can dedupe.
+    Symlinked directories are followed like glob does; directories already
+    walked (by device/inode) are skipped so symlink loops terminate.
+    """
+    candidates: List[os.DirEntry] = []
+    visited = set()
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            st = os.stat(current)
+            key = (st.st_dev, st.st_ino)
+            if key in visited:
+                continue
+            visited.add(key)
+            it = os.scandir(current)
+        except OSError as e:
+            logger.debug(f"Skipping unreadable directory {current}: {e}")
+            continue
+        with it:
+            for entry in it:
+                name = entry.name
+                # Like glob, skip hidden entries
+                if name.startswith('.'):
+                    continue
+                try:
+                    if entry.is_dir():
+                        stack.append(entry.path)
+                        continue
+                    if not entry.is_file():
+                        continue
+                except OSError:
+                    continue
+
+                if not COMPILED_DUMPS.match(name):
+                    continue
+                # Filter out unwanted files
+                if name.endswith(IGNORE_SUFFIXES) or COMPILED_IGNORE.search(name):
+                    continue
+                candidates.append(entry)
+
+    # stat() is the only per-file round trip left; on network mounts with
+    # many candidates, overlap the calls instead of paying them serially
+    if len(candidates) >= STAT_PARALLEL_MIN:
+        with ThreadPoolExecutor(max_workers=STAT_WORKERS) as executor:
+            stats = list(executor.map(_safe_stat, candidates))
+    else:
+        stats = [_safe_stat(entry) for entry in candidates]
+
+    dumps = []
+    for entry, stat in zip(candidates, stats):
+        if stat is None:
+            continue
+        dumps.append(((stat.st_dev, stat.st_ino), {
+            "path": entry.path,
+            "filename": entry.name,
+            "size": stat.st_size,
+            "modified": stat.st_mtime
+        }))
+    return dumps
+
+
 class CrashDiscovery:
     """
     Helper to discover crash dumps and matching kernels.
@@ -25,30 +155,28 @@ class CrashDiscovery:
         Scans given paths for crash dump files.
         Returns a list of dicts with 'path', 'filename', 'size', 'modified'.
         """
+        paths = [p for p in search_paths if os.path.isdir(p)]
+        if not paths:
+            return []
+
+        # Walks are I/O-bound: scan each search path (often separate mounts)
+        # concurrently so wall time is max(walk) rather than sum(walk)
+        if len(paths) == 1:
+            batches = [_scan_path(paths[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=min(8, len(paths))) as executor:
+                batches = list(executor.map(_scan_path, paths))
+
+        # Merge in search_paths order; dedupe files matched by several
+        # patterns or reachable from overlapping search paths
         dumps = []
-        for path in search_paths:
-            if not os.path.isdir(path):
-                continue
-            
-            for pattern in DUMP_PATTERNS:
-                full_pattern = os.path.join(path, "**", pattern)
-                # recursive search
-                for filepath in glob.glob(full_pattern, recursive=True):
-                    if os.path.isfile(filepath):
-                        # Filter out unwanted files
-                        filename = os.path.basename(filepath)
-                        if any(filename.endswith(ext) for ext in IGNORE_EXTENSIONS):
-                            continue
-                        if any(pat in filename for pat in IGNORE_PATTERNS):
-                            continue
-
-                        stat = os.stat(filepath)
-                        dumps.append({
-                            "path": filepath,
-                            "filename": os.path.basename(filepath),
-                            "size": stat.st_size,
-                            "modified": stat.st_mtime
-                        })
+        seen: Set[Tuple[int, int]] = set()
+        for batch in batches:
+            for key, dump in batch:
+                if key in seen:
+                    continue
+                seen.add(key)
+                dumps.append(dump)
         return dumps
 
     @staticmethod
@@ -58,16 +186,46 @@ class CrashDiscovery:
         This is a heuristic implementation.
         """
         # 1. Look in the same directory as the dump
+        # One directory read with plain prefix checks (KERNEL_PATTERNS are all
+        # "<prefix>*"), keeping the first hit per pattern in listing order
         dump_dir = os.path.dirname(dump_path)
-        for pattern in KERNEL_PATTERNS:
-            matches = glob.glob(os.path.join(dump_dir, pattern))
-            if matches:
-                 # Prefer vmlinux over system.map if multiple, or just take first
-                 # simple heuristic: look for vmlinux explicitly first
-                 vmlinux = next((m for m in matches if "vmlinux" in os.path.basename(m)), None)
-                 if vmlinux:
-                     return vmlinux
-                 return matches[0]
+        try:
+            dir_mtime = os.stat(dump_dir or ".").st_mtime_ns
+        except OSError:
+            dir_mtime = None
+        with _NO_KERNEL_LOCK:
+            known_empty = dir_mtime is not None and _NO_KERNEL_DIRS.get(dump_dir) == dir_mtime
+            if known_empty:
+                _NO_KERNEL_DIRS.move_to_end(dump_dir)
+        if known_empty:
+            logger.debug(f"No kernel image in {dump_dir or '.'} (unchanged since last scan)")
+            return None
+        
+        firsts: List[Optional[str]] = [None] * len(KERNEL_PREFIXES)
+        try:
+            with os.scandir(dump_dir or ".") as it:
+                for entry in it:
+                    name = entry.name
+                    for i, prefix in enumerate(KERNEL_PREFIXES):
+                        if name.startswith(prefix):
+                            # Prefer vmlinux over System.map: within a pattern,
+                            # a name mentioning vmlinux wins over the first hit
+                            if firsts[i] is None or ("vmlinux" in name and "vmlinux" not in firsts[i]):
+                                firsts[i] = name
+                            break
+        except OSError:
+            pass
+        for name in firsts:
+            if name is not None:
+                with _NO_KERNEL_LOCK:
+                    _NO_KERNEL_DIRS.pop(dump_dir, None)
+                return os.path.join(dump_dir, name)
+        if dir_mtime is not None:
+            with _NO_KERNEL_LOCK:
+                _NO_KERNEL_DIRS[dump_dir] = dir_mtime
+                _NO_KERNEL_DIRS.move_to_end(dump_dir)
+                while len(_NO_KERNEL_DIRS) > _NO_KERNEL_DIRS_MAX:
+                    _NO_KERNEL_DIRS.popitem(last=False)
 
         # 2. Look in global search paths (e.g. /usr/lib/debug/lib/modules...)
         # This is where we would implement more complex logic based on `file` output of the dump
@@ -84,8 +242,9 @@ class CrashDiscovery:
         Returns:
             Kernel version string (e.g., "5.15.0-generic") or None
         """
-        from crash_mcp.common.arch_detect import get_vmcore_kernel_version
-        return get_vmcore_kernel_version(dump_path)
+        from crash_mcp.common.arch_detect import parse_kdump_header
+        info = _cached_parse("kdump", (dump_path,), lambda: parse_kdump_header(dump_path))
+        return info.release if info else None
 
     @staticmethod
     def get_arch_from_dump(dump_path: str) -> Optional[Dict[str, str]]:
@@ -97,7 +256,7 @@ class CrashDiscovery:
         """
         from crash_mcp.common.arch_detect import detect_elf_arch
         
-        arch_info = detect_elf_arch(dump_path)
+        arch_info = _cached_parse("elf", (dump_path,), lambda: detect_elf_arch(dump_path))
         if arch_info:
             return {
                 "machine": arch_info.machine,
@@ -117,7 +276,7 @@ class CrashDiscovery:
         """
         from crash_mcp.common.arch_detect import parse_kdump_header
         
-        info = parse_kdump_header(dump_path)
+        info = _cached_parse("kdump", (dump_path,), lambda: parse_kdump_header(dump_path))
         if info:
             return {
                 "kernel_version": info.release,
@@ -140,4 +299,9 @@ class CrashDiscovery:
             Dict with 'match', 'vmcore_version', 'vmlinux_version', 'message'
         """
         from crash_mcp.common.arch_detect import check_vmcore_vmlinux_match
-        return check_vmcore_vmlinux_match(vmcore_path, vmlinux_path)
+        result = _cached_parse(
+            "match", (vmcore_path, vmlinux_path),
+            lambda: check_vmcore_vmlinux_match(vmcore_path, vmlinux_path)
+        )
+        # Hand out a copy so callers cannot mutate the cached entry
+        return dict(result)
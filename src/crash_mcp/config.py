@@ -1,4 +1,7 @@
 import os
+import functools
+from dataclasses import dataclass
+from pathlib import Path
 
 # Load environment variables from .env file (optional)
 try:
@@ -7,63 +10,120 @@ try:
 except ImportError:
     pass  # dotenv is optional
 
-class Config:
+
+def _env_bool(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() == "true"
+
+
+@dataclass(frozen=True, slots=True)
+class _Config:
+    """Process-wide settings, read from the environment once at import."""
     # Logging
-    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
-    LOG_TOOL_CALLS = os.getenv("LOG_TOOL_CALLS", "true").lower() == "true"
-    SUPPRESS_MCP_WARNINGS = os.getenv("SUPPRESS_MCP_WARNINGS", "true").lower() == "true"
+    LOG_LEVEL: str
+    LOG_TOOL_CALLS: bool
+    SUPPRESS_MCP_WARNINGS: bool
 
     # Crash Analysis specific (defaults)
-    CRASH_SEARCH_PATH = os.getenv("CRASH_SEARCH_PATH", "/var/crash")
+    CRASH_SEARCH_PATH: str
     
     # Extensions Configuration
     # Auto-load all extensions from CRASH_EXTENSION_PATH (true/false)
-    CRASH_EXTENSION_LOAD = os.getenv("CRASH_EXTENSION_LOAD", "true").lower() == "true"
+    CRASH_EXTENSION_LOAD: bool
     # Extension search paths (colon-separated), maps to crash's CRASH_EXTENSIONS env var
     # Default includes project lib/crash/extensions
-    CRASH_EXTENSION_PATH = os.getenv("CRASH_EXTENSION_PATH", "")
+    CRASH_EXTENSION_PATH: str
     
     # Output Pagination
-    OUTPUT_TRUNCATE_LINES = int(os.getenv("CRASH_MCP_TRUNCATE_LINES", "2000"))
+    OUTPUT_TRUNCATE_LINES: int
+    
+    # Seconds list_crash_dumps reuses a previous scan of the same path (0 = off;
+    # a positive value delays new dumps from showing up by up to that long)
+    DUMP_CACHE_TTL: float
     
     # Session Workdir Base
-    SESSION_WORKDIR_BASE = os.getenv("CRASH_MCP_WORKDIR", "/tmp/crash-mcp-sessions")
+    SESSION_WORKDIR_BASE: str
     
     # Command Cache Mode: disable / normal / force
     #   disable - no caching, always re-execute
     #   normal  - only cache commands that were persisted to disk (large/slow outputs)
     #   force   - cache all commands including small/fast ones in memory
-    COMMAND_CACHE_MODE = os.getenv("CRASH_MCP_CACHE", "normal").lower()
-    if COMMAND_CACHE_MODE not in ("disable", "normal", "force"):
-        COMMAND_CACHE_MODE = "normal"
+    COMMAND_CACHE_MODE: str
+    
+    # In-memory command cache bounds (LRU eviction of memory-only outputs)
+    COMMAND_CACHE_MAX_ENTRIES: int
+    COMMAND_CACHE_MAX_BYTES: int
     
     # Command Persistence Threshold (seconds)
     # Only save output to disk if execution time exceeds this value or output is truncated
-    COMMAND_SAVE_THRESHOLD_SECONDS = float(os.getenv("COMMAND_SAVE_THRESHOLD_SECONDS", "2.0"))
+    COMMAND_SAVE_THRESHOLD_SECONDS: float
+    
+    # Minimum seconds between manifest rewrites (pending entries are also
+    # written when a session is removed and at exit)
+    COMMAND_MANIFEST_FLUSH_SECONDS: float
 
     # External Tools
-    GET_DUMPINFO_SCRIPT = os.getenv("GET_DUMPINFO_SCRIPT", "")
+    GET_DUMPINFO_SCRIPT: str
     
     # Crash Binary Path (directory containing crash, crash-arm64, etc.)
-    CRASH_PATH = os.getenv("CRASH_PATH", "")
+    CRASH_PATH: str
     
     # External Scripts Path (colon-separated)
     # Scripts in these directories are auto-discovered by run_analysis_script
-    DRGN_SCRIPTS_PATH = os.getenv("DRGN_SCRIPTS_PATH", "")
+    DRGN_SCRIPTS_PATH: str
+    
+    # On-disk cache of parsed script metadata (empty disables)
+    SCRIPT_CACHE_PATH: str
+
 
+def _load() -> _Config:
+    """Read, coerce and validate all environment settings in one pass."""
+    cache_mode = os.getenv("CRASH_MCP_CACHE", "normal").lower()
+    if cache_mode not in ("disable", "normal", "force"):
+        cache_mode = "normal"
 
-def get_extension_paths() -> list:
-    """Get list of extension search paths for crash extensions."""
-    from pathlib import Path
+    return _Config(
+        LOG_LEVEL=os.getenv("LOG_LEVEL", "INFO"),
+        LOG_TOOL_CALLS=_env_bool("LOG_TOOL_CALLS", "true"),
+        SUPPRESS_MCP_WARNINGS=_env_bool("SUPPRESS_MCP_WARNINGS", "true"),
+        CRASH_SEARCH_PATH=os.getenv("CRASH_SEARCH_PATH", "/var/crash"),
+        CRASH_EXTENSION_LOAD=_env_bool("CRASH_EXTENSION_LOAD", "true"),
+        CRASH_EXTENSION_PATH=os.getenv("CRASH_EXTENSION_PATH", ""),
+        OUTPUT_TRUNCATE_LINES=int(os.getenv("CRASH_MCP_TRUNCATE_LINES", "2000")),
+        DUMP_CACHE_TTL=float(os.getenv("CRASH_MCP_DUMP_CACHE_TTL", "0")),
+        SESSION_WORKDIR_BASE=os.getenv("CRASH_MCP_WORKDIR", "/tmp/crash-mcp-sessions"),
+        COMMAND_CACHE_MODE=cache_mode,
+        COMMAND_CACHE_MAX_ENTRIES=int(os.getenv("CRASH_MCP_CACHE_MAX", "256")),
+        COMMAND_CACHE_MAX_BYTES=int(os.getenv("CRASH_MCP_CACHE_BYTES", str(64 * 1024 * 1024))),
+        COMMAND_SAVE_THRESHOLD_SECONDS=float(os.getenv("COMMAND_SAVE_THRESHOLD_SECONDS", "2.0")),
+        COMMAND_MANIFEST_FLUSH_SECONDS=float(os.getenv("CRASH_MCP_MANIFEST_FLUSH", "2.0")),
+        GET_DUMPINFO_SCRIPT=os.getenv("GET_DUMPINFO_SCRIPT", ""),
+        CRASH_PATH=os.getenv("CRASH_PATH", ""),
+        DRGN_SCRIPTS_PATH=os.getenv("DRGN_SCRIPTS_PATH", ""),
+        SCRIPT_CACHE_PATH=os.getenv(
+            "CRASH_MCP_SCRIPT_CACHE",
+            os.path.join(os.getenv("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "crash-mcp", "scripts.json"),
+        ),
+    )
+
+
+Config = _load()
+
+
+# Project root (config.py -> crash_mcp -> src -> project), resolved once
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+
+@functools.cache
+def get_extension_paths() -> tuple:
+    """Get extension search paths for crash extensions (stable per process, cached)."""
     paths = []
     
     # 1. User-configured paths (highest priority)
     if Config.CRASH_EXTENSION_PATH:
         paths.extend(p.strip() for p in Config.CRASH_EXTENSION_PATH.split(":") if p.strip())
     
-    # 2. Project lib/crash/extensions (relative to this file: config.py -> crash_mcp -> src -> project)
-    project_root = Path(__file__).resolve().parent.parent.parent
-    project_ext = project_root / "lib" / "crash" / "extensions"
+    # 2. Project lib/crash/extensions
+    project_ext = _PROJECT_ROOT / "lib" / "crash" / "extensions"
     if project_ext.exists():
         paths.append(str(project_ext))
     
@@ -72,5 +132,4 @@ def get_extension_paths() -> list:
     if user_ext.exists():
         paths.append(str(user_ext))
     
-    return paths 
-
+    return tuple(paths)
@@ -1,7 +1,9 @@
 """Global state for crash-mcp server."""
 import atexit
 import logging
-from typing import Dict, Optional
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
 from crash_mcp.common.base_session import BaseSession
 from crash_mcp.common.session_manager import SessionManager
 from crash_mcp.config import Config
@@ -11,26 +13,136 @@ logger = logging.getLogger("crash-mcp")
 # Session manager (singleton) - handles deduplication and workdir
 session_manager = SessionManager(Config.SESSION_WORKDIR_BASE)
 
+
+
+class SessionRegistry:
+    """Thread-safe session_id -> session map plus the default (last used) id.
+    
+    FastMCP may run tools concurrently, so lookups, removals and default
+    switching each happen under one lock instead of check-then-act on a
+    plain dict.
+    """
+    
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._sessions: Dict[str, BaseSession] = {}
+        self._last_id: Optional[str] = None
+    
+    @property
+    def last_id(self) -> Optional[str]:
+        return self._last_id
+    
+    def get(self, session_id: Optional[str] = None) -> Tuple[str, BaseSession]:
+        """Return (session_id, session), falling back to the default session.
+        
+        Raises:
+            ValueError: If no id was given and there is no default, or the
+                id is not registered.
+        """
+        with self._lock:
+            target_id = session_id or self._last_id
+            if not target_id:
+                raise ValueError("No session specified and no active default session.")
+            session = self._sessions.get(target_id)
+            if session is None:
+                raise ValueError(f"Session ID {target_id} not found.")
+            return target_id, session
+    
+    def put(self, session_id: str, session: BaseSession):
+        """Register a session and make it the default."""
+        with self._lock:
+            self._sessions[session_id] = session
+            self._last_id = session_id
+    
+    def pop(self, session_id: str, expected: Optional[BaseSession] = None) -> Optional[BaseSession]:
+        """Remove and return a session (None if absent).
+        
+        With `expected`, only remove if the entry is still that object, so a
+        stale caller cannot drop a session that replaced it.
+        """
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None or (expected is not None and session is not expected):
+                return None
+            del self._sessions[session_id]
+            if self._last_id == session_id:
+                self._last_id = None
+            return session
+    
+    def set_default(self, session_id: str) -> bool:
+        """Make `session_id` the default. Returns False if it is not registered."""
+        with self._lock:
+            if session_id not in self._sessions:
+                return False
+            self._last_id = session_id
+            return True
+    
+    def items(self) -> List[Tuple[str, BaseSession]]:
+        """Snapshot of (session_id, session) pairs."""
+        with self._lock:
+            return list(self._sessions.items())
+    
+    def clear(self):
+        with self._lock:
+            self._sessions.clear()
+            self._last_id = None
+    
+    def __contains__(self, session_id: str) -> bool:
+        with self._lock:
+            return session_id in self._sessions
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+
 # Session storage (UnifiedSession instances)
-sessions: Dict[str, BaseSession] = {}
-last_session_id: Optional[str] = None
+sessions = SessionRegistry()
+
+
+# Overall deadline for closing sessions at exit (seconds)
+CLEANUP_TIMEOUT = 5.0
+
+
+def _close_one(session_id: str, session: BaseSession):
+    """Close a single session and drop it from session_manager."""
+    try:
+        if session.is_active():
+            session.close()
+            logger.info(f"Session {session_id} closed.")
+        elif getattr(session, "command_store", None):
+            # close() is skipped for dead sessions; still persist the manifest
+            session.command_store.flush()
+        session_manager.remove_session(session_id)  # Sync with session_manager
+    except Exception as e:
+        logger.warning(f"Error closing session {session_id}: {e}")
 
 
 def _cleanup_sessions():
-    """Clean up all active sessions on exit."""
-    global sessions, last_session_id
+    """Clean up all active sessions on exit, closing them concurrently."""
     if sessions:
         logger.info(f"Cleaning up {len(sessions)} active session(s)...")
-        for session_id, session in list(sessions.items()):
+        # concurrent.futures refuses new work once interpreter shutdown has
+        # begun (atexit), so use plain daemon threads with a shared deadline.
+        threads = []
+        for session_id, session in sessions.items():
+            t = threading.Thread(target=_close_one, args=(session_id, session), daemon=True)
             try:
-                if session.is_active():
-                    session.close()
-                    logger.info(f"Session {session_id} closed.")
-                session_manager.remove_session(session_id)  # Sync with session_manager
-            except Exception as e:
-                logger.warning(f"Error closing session {session_id}: {e}")
+                t.start()
+            except RuntimeError:
+                # Thread creation not allowed at this point; close inline
+                _close_one(session_id, session)
+                continue
+            threads.append(t)
+        
+        deadline = time.monotonic() + CLEANUP_TIMEOUT
+        for t in threads:
+            t.join(max(0.0, deadline - time.monotonic()))
+        pending = sum(t.is_alive() for t in threads)
+        if pending:
+            logger.warning(f"{pending} session(s) did not close within {CLEANUP_TIMEOUT}s")
+        
         sessions.clear()
-        last_session_id = None
 
 
 # Register cleanup handler
@@ -1,5 +1,7 @@
 import logging
 import os
+import re
+import pexpect
 from pathlib import Path
 from typing import Optional, List, Tuple
 from crash_mcp.common.base_session import BaseSession
@@ -7,13 +9,18 @@ from crash_mcp.config import Config
 
 logger = logging.getLogger(__name__)
 
+# Fields of crash's 'set' output, e.g. "      pid: 1234" / "      cpu: -1"
+_PID_RE = re.compile(r'^\s*pid:\s*(\d+)', re.MULTILINE)
+_CPU_RE = re.compile(r'^\s*cpu:\s*(-?\d+)', re.MULTILINE)
+
 class CrashSession(BaseSession):
     """
     Manages an interactive session with the 'crash' utility.
     Supports automatic architecture detection and crash binary selection.
     """
     # Prompt pattern matches: "crash> ", "crash-arm64> ", etc.
-    PROMPT = r'crash[-\w]*> '
+    # Compiled once so pexpect does not recompile it on every expect()
+    PROMPT = re.compile(r'crash[-\w]*> ')
 
     def __init__(self, dump_path: str, kernel_path: Optional[str] = None, binary_path: str = None,
                  remote_host: Optional[str] = None, remote_user: Optional[str] = None, ssh_key: Optional[str] = None,
@@ -48,6 +55,8 @@ class CrashSession(BaseSession):
         super().__init__(dump_path, kernel_path, final_binary_path, remote_host, remote_user, ssh_key)
         
         self.crash_args = crash_args or []
+        # Scratch file for inline pykdump code (see run_pykdump)
+        self._pykdump_script: Optional[str] = None
 
     def _auto_select_binary(self, dump_path, kernel_path) -> Tuple[str, Optional[str]]:
         """Auto-select crash binary based on vmcore architecture."""
@@ -88,9 +97,9 @@ class CrashSession(BaseSession):
         Handle post-start initialization (wait for prompt, configure session).
         """
         # Expect the initial prompt
-        logger.debug(f"Waiting for prompt: {self.PROMPT}")
+        logger.debug(f"Waiting for prompt: {self.PROMPT.pattern}")
         try:
-            self._process.expect(self.PROMPT, timeout=10)
+            self._expect_prompt(timeout=10)
             logger.debug("Initial prompt matched.")
         except pexpect.TIMEOUT:
             logger.error(f"Timeout waiting for startup prompt. Output found so far: {repr(self._process.before)}")
@@ -101,11 +110,11 @@ class CrashSession(BaseSession):
         
         # Disable scrolling/paging to avoid hanging on long output
         self._process.sendline('set scroll off')
-        self._process.expect(self.PROMPT)
+        self._expect_prompt()
 
         # Disable Debuginfod to prevent GDB from hanging on network requests
         self._process.sendline('gdb set debuginfod enabled off')
-        self._process.expect(self.PROMPT)
+        self._expect_prompt()
 
 
     def get_default_context(self) -> dict:
@@ -115,7 +124,6 @@ class CrashSession(BaseSession):
         Returns:
             Dict with 'pid' and/or 'cpu' keys if available.
         """
-        import re
         context = {}
         
         try:
@@ -123,13 +131,14 @@ class CrashSession(BaseSession):
             output = self.execute_command('set', timeout=10, truncate=False)
             
             # Parse pid: looks like "      pid: 1234"
-            pid_match = re.search(r'^\s*pid:\s*(\d+)', output, re.MULTILINE)
+            # (literal check first so the regex only runs when it can match)
+            pid_match = _PID_RE.search(output) if 'pid:' in output else None
             if pid_match:
                 context['pid'] = pid_match.group(1)
                 logger.debug(f"Crash default pid: {context['pid']}")
             
             # Parse cpu: looks like "      cpu: 0" or "      cpu: -1" (any)
-            cpu_match = re.search(r'^\s*cpu:\s*(-?\d+)', output, re.MULTILINE)
+            cpu_match = _CPU_RE.search(output) if 'cpu:' in output else None
             if cpu_match:
                 cpu_val = cpu_match.group(1)
                 # Only track if specific CPU is set (not -1 which means "any")
@@ -164,44 +173,37 @@ class CrashSession(BaseSession):
             # Fix potential double-escaped newlines from LLM
             script_or_code = script_or_code.replace('\\n', '\n')
             
-            # epython in mpykdump may not support -c, so we write to a temp file
-            import tempfile
-            import os
-            
-            # Create a temp file in the current working directory or /tmp
-            # We prefer CWD so crash can see it easily if there are path issues,
-            # but /tmp is cleaner. Let's try to write to a known temp location accessible by crash.
-            # Since we are running crash essentially locally, /tmp is fine.
-            # Note: We need to ensure the file persists until executed.
-            
-            # We'll create a file with a unique name
-            fd, path = tempfile.mkstemp(suffix=".py", text=True)
-            with os.fdopen(fd, 'w') as f:
+            # epython in mpykdump may not support -c, so we write to a temp file.
+            # One scratch file per session is rewritten in place for every call
+            # (instead of mkstemp + unlink each time) and removed on close().
+            # Calls are serialized by the crash prompt, so reuse is safe.
+            path = self._get_pykdump_script_path()
+            with open(path, 'w') as f:
                 f.write(script_or_code)
             
-            # We must remember to clean this up, but execute_command is synchronous.
-            # However, prompt return does not guarantee command finished if we backgrounded it,
-            # but here we wait for prompt.
-            
             cmd = f"epython {path}"
             
-            # We can try to append a cleanup command? No, crash shell doesn't do chaining easily like shell.
-            # We will just execute it. The file will remain in /tmp.
-            # For a long running service this is bad, but for a session it is acceptable
-            # or we can try to delete it after.
-            
-        try:
-             result = self.execute_command(cmd, timeout=timeout, truncate=truncate)
-        finally:
-             if not is_file and 'path' in locals() and os.path.exists(path):
-                 try:
-                    os.unlink(path)
-                 except OSError:
-                    pass
+        return self.execute_command(cmd, timeout=timeout, truncate=truncate)
 
-        return result
+    def _get_pykdump_script_path(self) -> str:
+        """Return this session's pykdump scratch file, creating it on first use."""
+        if self._pykdump_script is None:
+            import tempfile
+            fd, self._pykdump_script = tempfile.mkstemp(suffix=".py", text=True)
+            os.close(fd)
+        return self._pykdump_script
 
-    def _smart_truncate(self, output: str, command: str) -> str:
+    def close(self):
+        super().close()
+        # Remove the pykdump scratch file, if one was created
+        if self._pykdump_script is not None:
+            try:
+                os.unlink(self._pykdump_script)
+            except OSError:
+                pass
+            self._pykdump_script = None
+
+    def _smart_truncate(self, output: str, command: str, skipped: int = 0) -> str:
         """
         Override smart truncation to handle specific commands like 'log'.
         """
@@ -215,13 +217,13 @@ class CrashSession(BaseSession):
         clean_cmd = command.strip().split()[0]
         
         if clean_cmd == 'log':
-            removed_chars = len(output) - MAX_LEN
-            logger.warning(f"Output truncated (log tail). Original length: {len(output)}. Removed {removed_chars} chars.")
+            removed_chars = len(output) - MAX_LEN + skipped
+            logger.warning(f"Output truncated (log tail). Original length: {len(output) + skipped}. Removed {removed_chars} chars.")
             # Tail-Only Strategy for log: Keep last MAX_LEN
-            return (
-                f"... [Log truncated (Head). Showing last {MAX_LEN} chars] ...\n\n" + 
-                output[-MAX_LEN:]
-            )
+            return "".join((
+                f"... [Log truncated (Head). Showing last {MAX_LEN} chars] ...\n\n",
+                output[-MAX_LEN:],
+            ))
         
         # Delegate to default strategy for other commands
-        return super()._smart_truncate(output, command)
+        return super()._smart_truncate(output, command, skipped=skipped)
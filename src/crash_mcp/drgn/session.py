@@ -1,12 +1,79 @@
 import logging
 import os
+import re
 from typing import List, Optional
 from crash_mcp.common.base_session import BaseSession
 
 logger = logging.getLogger(__name__)
 
+# ANSI escape sequences emitted by the drgn REPL around echoed input
+_ANSI_ESCAPE_RE = re.compile(r'\x1b\[[0-9;?]*[a-zA-Z]')
+
+
+def _strip_echo(raw_output: str, input_lines: List[str]) -> str:
+    """Remove the REPL echo of `input_lines` from the start of `raw_output`."""
+    # Fast path: a single-line command echoed as the first line, optionally
+    # behind a prompt. Literal comparison only; anything else (ANSI escapes,
+    # bare ">>>" lines, multi-line input) takes the line-by-line path.
+    if len(input_lines) == 1:
+        first, _, rest = raw_output.partition('\n')
+        first = first.strip()
+        if first.startswith((">>> ", "... ")):
+            first = first[4:]
+        if first == input_lines[0].strip():
+            return "\n".join(rest.splitlines()).strip()
+    
+    # Slow path: compare line by line
+    output_lines = raw_output.splitlines()
+    
+    cleaned_output = []
+    input_idx = 0
+    
+    # We only strip from the *beginning* of the output.
+    stripping = True
+    
+    for line in output_lines:
+        if not stripping:
+            cleaned_output.append(line)
+            continue
+            
+        if input_idx >= len(input_lines):
+            # Exhausted input, rest is output
+            if line.strip() == "":
+                continue # Skip empty line separator
+            else:
+                stripping = False
+                cleaned_output.append(line)
+            continue
+        
+        target = input_lines[input_idx].strip()
+        current = line.strip()
+        
+        # Remove prompt prefixes
+        if current.startswith(">>> "):
+            current = current[4:]
+        elif current.startswith("... "):
+            current = current[4:]
+        
+        # Clean ANSI (memchr check first; most lines have no escapes)
+        if '\x1b' in current:
+            current = _ANSI_ESCAPE_RE.sub('', current)
+            
+        if current == target:
+            input_idx += 1
+        else:
+            # Mismatch. 
+            if current in ["...", ">>>"]:
+                 continue
+            
+            stripping = False
+            cleaned_output.append(line)
+            
+    return "\n".join(cleaned_output).strip()
+
+
 class DrgnSession(BaseSession):
-    PROMPT = r'>>> '
+    PROMPT = re.compile(r'>>> ')
 
     def __init__(self, dump_path: str, kernel_path: Optional[str] = None, binary_path: str = 'drgn', tools_path: str = "", **kwargs):
         super().__init__(dump_path, kernel_path, binary_path, **kwargs)
@@ -46,7 +113,7 @@ class DrgnSession(BaseSession):
         self._process.expect(expected_result)
         
         # Then we expect the prompt.
-        self._process.expect(self.PROMPT)
+        self._expect_prompt()
         
     from typing import Callable
 
@@ -71,7 +138,7 @@ class DrgnSession(BaseSession):
             # Expect the output token (proving execution finished)
             self._process.expect(token)
             # Then expect the prompt
-            self._process.expect(self.PROMPT)
+            self._expect_prompt()
             
             # 3. Final Sync to ensure buffer clear
             self._sync()
@@ -81,12 +148,13 @@ class DrgnSession(BaseSession):
         if not self.is_active():
             raise RuntimeError("Drgn session is not active")
             
-        # [Ported Feature] Automatically use run_script for multi-line commands
         # [Ported Feature] Automatically use run_script for multi-line commands
         stripped_cmd = command.strip()
+        # Scan for a newline once; both routing checks below reuse it
+        is_multiline = '\n' in stripped_cmd
         
         # 1. Check if it's a file path (ends with .py)
-        if stripped_cmd.endswith('.py') and not '\n' in stripped_cmd:
+        if not is_multiline and stripped_cmd.endswith('.py'):
             script_path = stripped_cmd
             # Support absolute path or relative to CWD
             if os.path.exists(script_path):
@@ -101,71 +169,19 @@ class DrgnSession(BaseSession):
                 return f"Error: Script not found: {script_path}"
 
         # 2. Multi-line command -> run_script (base64)
-        if '\n' in stripped_cmd:
+        if is_multiline:
             return self.run_script(stripped_cmd)
             
         self._process.sendline(command)
-        self._process.expect(self.PROMPT, timeout=timeout)
-        raw_output = self._process.before
+        raw_output, skipped = self._read_until_prompt(timeout, bounded=truncate)
         
         # Smart Echo Stripping
         # The REPL echoes input lines. Continuation lines are prefixed with "... "
         # We want to remove all lines that correspond to the input command.
-        
-        input_lines = command.strip().splitlines()
-        output_lines = raw_output.splitlines()
-        
-        cleaned_output = []
-        input_idx = 0
-        
-        # We iterate through output lines and try to match them with input lines
-        
-        # We only strip from the *beginning* of the output.
-        stripping = True
-        
-        import re
-        ansi_escape = re.compile(r'\x1b\[[0-9;?]*[a-zA-Z]')
-        
-        for line in output_lines:
-            if not stripping:
-                cleaned_output.append(line)
-                continue
-                
-            if input_idx >= len(input_lines):
-                # Exhausted input, rest is output
-                if line.strip() == "":
-                    continue # Skip empty line separator
-                else:
-                    stripping = False
-                    cleaned_output.append(line)
-                continue
-            
-            target = input_lines[input_idx].strip()
-            current = line.strip()
-            
-            # Remove prompt prefixes
-            if current.startswith(">>> "):
-                current = current[4:]
-            elif current.startswith("... "):
-                current = current[4:]
-            
-            # Clean ANSI
-            current = ansi_escape.sub('', current)
-                
-            if current == target:
-                input_idx += 1
-            else:
-                # Mismatch. 
-                if current in ["...", ">>>"]:
-                     continue
-                
-                stripping = False
-                cleaned_output.append(line)
-                
-        result = "\n".join(cleaned_output).strip()
+        result = _strip_echo(raw_output, stripped_cmd.splitlines())
         
         if truncate:
-            return self._smart_truncate(result, command)
+            return self._smart_truncate(result, command, skipped=skipped)
         return result
 
     def run_script(self, script: str) -> str:
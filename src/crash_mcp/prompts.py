@@ -1,5 +1,6 @@
 import os
 import logging
+import functools
 from mcp.server.fastmcp import FastMCP
 from crash_mcp.config import Config
 
@@ -12,8 +13,13 @@ except ImportError:
 
 SYSTEM_PROMPT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'docs', 'system_prompt.md')
 
+@functools.cache
 def get_system_prompt() -> str:
-    """Read the system prompt from package resources or fallback to doc file."""
+    """
+    Read the system prompt from package resources or fallback to doc file.
+    The result is cached for the process; call get_system_prompt.cache_clear()
+    to pick up edits during development.
+    """
     base_prompt = ""
     
     # Priority 1: Package Resource (Production / Install)
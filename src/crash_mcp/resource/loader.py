@@ -8,11 +8,30 @@ Supports:
 """
 import os
 import re
+import ast
+import json
 import logging
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any, Optional
 
 logger = logging.getLogger("crash-mcp")
 
+
+@functools.cache
+def _get_yaml():
+    """
+    Import PyYAML on first use (keeps it off the server startup path).
+    Returns (yaml, Loader) preferring the libyaml-backed CSafeLoader, or None
+    if PyYAML is not installed.
+    """
+    try:
+        import yaml
+    except ImportError:
+        return None
+    return yaml, getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
 # =============================================================================
 # Path Utilities
 # =============================================================================
@@ -47,6 +66,10 @@ def get_scripts_config_path() -> str:
 # Frontmatter Parsing
 # =============================================================================
 
+# Docstring with YAML frontmatter
+# Pattern: optional shebang, then """ or ''' followed by newline, ---, yaml content, ---, rest
+_FRONTMATTER_RE = re.compile(r'^(?:#!.*\n)?["\']{3}\s*\n---\s*\n(.*?)\n---\s*\n', re.DOTALL)
+
 def parse_yaml_frontmatter(content: str) -> Optional[Dict[str, Any]]:
     """
     Parse YAML frontmatter from script content.
@@ -64,22 +87,29 @@ def parse_yaml_frontmatter(content: str) -> Optional[Dict[str, Any]]:
     Actual docstring...
     '''
     """
-    # Match docstring with YAML frontmatter
-    # Pattern: optional shebang, then """ or ''' followed by newline, ---, yaml content, ---, rest
-    pattern = r'^(?:#!.*\n)?["\']{{3}}\s*\n---\s*\n(.*?)\n---\s*\n'.replace('{{3}}', '{3}')
-    match = re.match(pattern, content, re.DOTALL)
+    # Cheap reject: frontmatter opens within the first few lines, so scripts
+    # without a docstring + '---' there never reach the regex
+    head = content[:512]
+    if '---' not in head or ('"""' not in head and "'''" not in head):
+        return None
+    
+    match = _FRONTMATTER_RE.match(content)
     
     if not match:
         return None
     
-    yaml_content = match.group(1)
-    
-    try:
-        import yaml
-        return yaml.safe_load(yaml_content)
-    except ImportError:
+    return _load_frontmatter_yaml(match.group(1))
+
+
+def _load_frontmatter_yaml(yaml_content: str) -> Optional[Dict[str, Any]]:
+    pyyaml = _get_yaml()
+    if pyyaml is None:
         # Fallback: simple YAML-like parsing for basic cases
         return _parse_simple_yaml(yaml_content)
+    
+    try:
+        yaml, loader = pyyaml
+        return yaml.load(yaml_content, Loader=loader)
     except Exception as e:
         logger.warning(f"Failed to parse YAML frontmatter: {e}")
         return None
@@ -88,111 +118,248 @@ def parse_yaml_frontmatter(content: str) -> Optional[Dict[str, Any]]:
 def _parse_simple_yaml(content: str) -> Dict[str, Any]:
     """
     Simple YAML parser for basic key-value pairs (fallback without PyYAML).
-    Supports nested dictionaries (recursively).
+    Supports nested dictionaries, built in one pass with a stack of blocks.
     """
-    lines = [l for l in content.splitlines() if l.strip()]
-    
-    def _parse_block(start_idx: int, min_indent: int) -> tuple[Dict[str, Any], int]:
-        result = {}
-        i = start_idx
-        
-        while i < len(lines):
-            line = lines[i]
-            indent = len(line) - len(line.lstrip())
-            
-            # If we drop below current block's indent, we are done
-            if indent < min_indent:
-                return result, i
-            
-            # Skip deeper indented lines (children handled by recursion)
-            if indent > min_indent:
-                # Should have been consumed by previous key's recursion, 
-                # but if we are here, it might be a malformed structure or comment, skip
-                i += 1
-                continue
-                
-            stripped = line.strip()
-            if ':' in stripped:
-                key, _, value_part = stripped.partition(':')
-                key = key.strip()
-                value_part = value_part.strip()
-                
-                if value_part:
-                    # Leaf node (Key: Value)
-                    result[key] = value_part
-                    i += 1
-                else:
-                    # Parent node (Key: \n ...)
-                    # Look ahead to determine child indent
-                    if i + 1 < len(lines):
-                        next_line = lines[i+1]
-                        next_indent = len(next_line) - len(next_line.lstrip())
-                        
-                        if next_indent > indent:
-                            child_dict, new_i = _parse_block(i + 1, next_indent)
-                            result[key] = child_dict
-                            i = new_i
-                        else:
-                            # Next line not indented, empty dict
-                            result[key] = {}
-                            i += 1
-                    else:
-                        result[key] = {}
-                        i += 1
-            else:
-                # Not a key-value line, skip
-                i += 1
-                
-        return result, i
-
-    # Parse root block (indent 0 usually, but we accept whatever starts)
+    # (indent, stripped text) per non-empty line, computed once
+    lines = []
+    for l in content.splitlines():
+        stripped = l.lstrip()
+        if stripped:
+            lines.append((len(l) - len(stripped), stripped.rstrip()))
     if not lines:
         return {}
+    
+    result: Dict[str, Any] = {}
+    # Open blocks as (indent, dict); the root block starts at the first line's indent
+    stack = [(lines[0][0], result)]
+    
+    for i, (indent, stripped) in enumerate(lines):
+        # Dropping below a block's indent closes it; below the root ends parsing
+        while indent < stack[-1][0]:
+            stack.pop()
+            if not stack:
+                return result
+        
+        # Lines deeper than the current block (not a child of a parent key,
+        # e.g. under a leaf) are skipped, as are lines without a key
+        if indent > stack[-1][0] or ':' not in stripped:
+            continue
         
-    base_indent = len(lines[0]) - len(lines[0].lstrip())
-    parsed, _ = _parse_block(0, base_indent)
-    return parsed
+        block = stack[-1][1]
+        key, _, value_part = stripped.partition(':')
+        key = key.strip()
+        value_part = value_part.strip()
+        
+        if value_part:
+            # Leaf node (Key: Value)
+            block[key] = value_part
+            continue
+        
+        # Parent node (Key: \n ...): children are the following deeper lines
+        child: Dict[str, Any] = {}
+        block[key] = child
+        if i + 1 < len(lines) and lines[i + 1][0] > indent:
+            stack.append((lines[i + 1][0], child))
+    
+    return result
+
+
+# Module docstring: shebang/comment/blank lines, then a triple-quoted literal
+# that forms the whole first statement
+_DOCSTRING_RE = re.compile(
+    r'(?:[ \t]*(?:#[^\n]*)?\n)*'
+    r'(?P<lit>[rRuU]?(?P<q>"""|\'\'\')(?:\\.|(?!(?P=q)).)*?(?P=q))'
+    r'(?=[ \t]*(?:[#;\r\n]|\Z))',
+    re.DOTALL
+)
+
+
+def _extract_docstring(content: str) -> Optional[str]:
+    """Return the module docstring via a regex scan, or None if not found."""
+    match = _DOCSTRING_RE.match(content)
+    if not match:
+        return None
+    try:
+        docstring = ast.literal_eval(match.group('lit'))
+    except (ValueError, SyntaxError):
+        return None
+    return docstring if isinstance(docstring, str) else None
 
 
 def parse_docstring_fallback(content: str) -> Dict[str, Any]:
     """
     Fallback parser: extract description from first docstring line.
     """
-    import ast
     result = {"description": "(No description)", "params": {}}
     
     try:
-        module = ast.parse(content)
-        docstring = ast.get_docstring(module)
+        # Cheap scan first; compile the whole script only if that misses
+        docstring = _extract_docstring(content)
+        if docstring is None:
+            docstring = ast.get_docstring(ast.parse(content))
         
         if docstring:
-            lines = [l.strip() for l in docstring.splitlines() if l.strip()]
-            
-            # Skip YAML frontmatter markers if present
-            if lines and lines[0] == '---':
-                # Find end of frontmatter
-                try:
-                    end_idx = lines.index('---', 1)
-                    lines = lines[end_idx + 1:]
-                except ValueError:
-                    pass
-            
-            if lines:
-                result["description"] = lines[0]
-                
-            # Try to extract params from "用法:" or "Usage:" line
-            for line in lines:
-                if "用法:" in line or "Usage:" in line:
-                    parts = line.split(":", 1)
-                    if len(parts) > 1:
-                        result["usage"] = parts[1].strip()
-                    break
+            _describe_docstring(docstring, result)
     except Exception:
         pass
         
     return result
 
 
+def _describe_docstring(docstring: str, result: Dict[str, Any]):
+    """Fill description/usage in `result` from a module docstring."""
+    lines = [l.strip() for l in docstring.splitlines() if l.strip()]
+    
+    # Skip YAML frontmatter markers if present
+    if lines and lines[0] == '---':
+        # Find end of frontmatter
+        try:
+            end_idx = lines.index('---', 1)
+            lines = lines[end_idx + 1:]
+        except ValueError:
+            pass
+    
+    if lines:
+        result["description"] = lines[0]
+        
+    # Try to extract params from "用法:" or "Usage:" line
+    for line in lines:
+        if "用法:" in line or "Usage:" in line:
+            parts = line.split(":", 1)
+            if len(parts) > 1:
+                result["usage"] = parts[1].strip()
+            break
+
+
+# Frontmatter inside an already-located docstring body
+_FRONTMATTER_BODY_RE = re.compile(r'\s*\n---\s*\n(.*?)\n---\s*\n', re.DOTALL)
+
+
+def extract_metadata(content: str) -> Optional[Dict[str, Any]]:
+    """
+    Locate the module docstring once and derive metadata from it.
+    
+    Returns {'frontmatter': dict} when the docstring opens with YAML
+    frontmatter, {'fallback': {...}} (as parse_docstring_fallback) otherwise,
+    or None if the scan could not find a docstring at all.
+    """
+    match = _DOCSTRING_RE.match(content)
+    if not match:
+        return None
+    
+    literal = match.group('lit')
+    quote = match.group('q')
+    body = literal[literal.index(quote) + 3:-3]
+    
+    fm_match = _FRONTMATTER_BODY_RE.match(body)
+    if fm_match:
+        frontmatter = _load_frontmatter_yaml(fm_match.group(1))
+        if frontmatter:
+            return {'frontmatter': frontmatter}
+    
+    result = {"description": "(No description)", "params": {}}
+    try:
+        docstring = ast.literal_eval(literal)
+    except (ValueError, SyntaxError):
+        return None
+    if isinstance(docstring, str) and docstring:
+        _describe_docstring(docstring, result)
+    return {'fallback': result}
+
+
+# =============================================================================
+# Metadata Cache
+# =============================================================================
+
+# Bump when the cached meta format changes; older cache files are ignored
+_SCRIPT_CACHE_VERSION = 1
+
+# Chars read from each script when looking for frontmatter
+SCRIPT_HEAD_CHARS = 8192
+
+# Scripts to parse from which discovery uses a thread pool
+SCRIPT_PARALLEL_MIN = 8
+SCRIPT_WORKERS = 32
+
+
+def _load_script_cache() -> Dict[str, Dict[str, Any]]:
+    """Load cached {path: {mtime_ns, size, meta}} entries, or {} if unusable."""
+    from crash_mcp.config import Config
+    
+    if not Config.SCRIPT_CACHE_PATH:
+        return {}
+    try:
+        with open(Config.SCRIPT_CACHE_PATH, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get('version') != _SCRIPT_CACHE_VERSION:
+        return {}
+    entries = data.get('entries')
+    return entries if isinstance(entries, dict) else {}
+
+
+def _save_script_cache(entries: Dict[str, Dict[str, Any]]):
+    """Atomically write the metadata cache; failures only cost a re-parse."""
+    from crash_mcp.config import Config
+    
+    path = Config.SCRIPT_CACHE_PATH
+    if not path:
+        return
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'version': _SCRIPT_CACHE_VERSION, 'entries': entries}, f)
+        os.replace(tmp, path)
+    except (OSError, TypeError, ValueError) as e:
+        logger.debug(f"Failed to write script cache {path}: {e}")
+
+
+def _json_stable(meta: Dict[str, Any]) -> bool:
+    """True if `meta` survives a JSON round-trip unchanged.
+    
+    YAML frontmatter can hold non-str keys, tuples, dates... that JSON
+    would coerce, so a cached copy would differ from a fresh parse.
+    """
+    try:
+        return json.loads(json.dumps(meta)) == meta
+    except (TypeError, ValueError):
+        return False
+
+
+def _clear_script_cache():
+    from crash_mcp.config import Config
+    
+    if Config.SCRIPT_CACHE_PATH:
+        try:
+            os.unlink(Config.SCRIPT_CACHE_PATH)
+        except OSError:
+            pass
+
+
+def _parse_script_meta(script_name: str, script_path: str, info: Dict[str, Any]) -> Dict[str, Any]:
+    """Build metadata from extract_metadata()-style info for a script."""
+    # Priority 2: YAML frontmatter
+    frontmatter = info.get('frontmatter')
+    if frontmatter:
+        return {
+            'description': frontmatter.get('description', ''),
+            'params': _normalize_params(frontmatter.get('params', {})),
+            'file': script_path,
+            'category': frontmatter.get('category', _categorize_script(script_name))
+        }
+    
+    # Priority 3: Docstring fallback
+    fallback = info['fallback']
+    return {
+        'description': fallback.get('description', ''),
+        'params': {},  # Cannot extract params from basic docstring
+        'file': script_path,
+        'category': _categorize_script(script_name)
+    }
+
+
 # =============================================================================
 # Script Discovery
 # =============================================================================
@@ -204,21 +371,46 @@ def load_external_config() -> Dict[str, Dict[str, Any]]:
     if not os.path.exists(config_path):
         return {}
     
+    pyyaml = _get_yaml()
+    if pyyaml is None:
+        logger.warning("PyYAML not installed, skipping scripts.yaml")
+        return {}
+    
     try:
-        import yaml
+        yaml, loader = pyyaml
         with open(config_path, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=loader)
         if config and isinstance(config.get('scripts'), dict):
             return config['scripts']
         return {}
-    except ImportError:
-        logger.warning("PyYAML not installed, skipping scripts.yaml")
-        return {}
     except Exception as e:
         logger.warning(f"Failed to load scripts.yaml: {e}")
         return {}
 
 
+def _read_script_meta(script_name: str, script_path: str) -> Optional[Dict[str, Any]]:
+    """Read and parse one script's metadata; None if it cannot be read."""
+    # The docstring (and any frontmatter in it) sits at the top, so
+    # read only the head unless it is not complete there
+    try:
+        with open(script_path, 'r', encoding='utf-8') as f:
+            content = f.read(SCRIPT_HEAD_CHARS)
+            info = extract_metadata(content)
+            if info is None and len(content) == SCRIPT_HEAD_CHARS:
+                content += f.read()
+                info = extract_metadata(content)
+    except Exception as e:
+        logger.warning(f"Failed to read {os.path.basename(script_path)}: {e}")
+        return None
+    
+    if info is None:
+        # No docstring found by the scan: frontmatter regex + ast path
+        frontmatter = parse_yaml_frontmatter(content)
+        info = {'frontmatter': frontmatter} if frontmatter else {'fallback': parse_docstring_fallback(content)}
+    
+    return _parse_script_meta(script_name, script_path, info)
+
+
 def discover_scripts() -> Dict[str, Dict[str, Any]]:
     """
     Auto-discover all scripts with metadata from configured directories.
@@ -241,63 +433,111 @@ def discover_scripts() -> Dict[str, Dict[str, Any]]:
     # Load external config first
     external_config = load_external_config()
     
-    # Scan all configured directories
+    # Parsed metadata from earlier runs; `seen` becomes the new cache
+    cache = _load_script_cache()
+    seen: Dict[str, Dict[str, Any]] = {}
+    dirty = False
+    
+    # Phase 1: list candidates from all configured directories, in order
+    candidates = []
     for scripts_dir in scripts_dirs:
-        for filename in sorted(os.listdir(scripts_dir)):
-            if not filename.endswith('.py') or filename.startswith('_'):
-                continue
-                
-            script_name = filename[:-3]  # Remove .py
-            
-            # Skip if already discovered (first path wins)
-            if script_name in registry:
-                continue
-                
-            script_path = os.path.join(scripts_dir, filename)
-            
-            try:
-                with open(script_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-            except Exception as e:
-                logger.warning(f"Failed to read {filename}: {e}")
-                continue
-            
-            # Priority 1: External config
-            if script_name in external_config:
-                meta = external_config[script_name].copy()
-                meta.setdefault('file', script_path)
-                meta['params'] = _normalize_params(meta.get('params', {}))
-                registry[script_name] = meta
-                continue
-            
-            # Priority 2: YAML frontmatter
-            frontmatter = parse_yaml_frontmatter(content)
-            if frontmatter:
-                meta = {
-                    'description': frontmatter.get('description', ''),
-                    'params': _normalize_params(frontmatter.get('params', {})),
-                    'file': script_path,
-                    'category': frontmatter.get('category', _categorize_script(script_name))
-                }
-                registry[script_name] = meta
-                continue
+        # One scandir per directory; DirEntry carries name, type and stat
+        try:
+            with os.scandir(scripts_dir) as it:
+                entries = sorted(
+                    (e for e in it if e.name.endswith('.py') and not e.name.startswith('_') and e.is_file()),
+                    key=lambda e: e.name
+                )
+        except OSError as e:
+            logger.warning(f"Failed to list {scripts_dir}: {e}")
+            continue
+        candidates.extend(entries)
+    
+    # Phase 2: read + parse, concurrently, the first candidate per name that
+    # is neither configured in scripts.yaml nor fresh in the cache
+    stats = {}
+    to_parse = {}
+    for entry in candidates:
+        script_name = entry.name[:-3]
+        if script_name in to_parse or script_name in external_config or script_name in stats:
+            continue
+        try:
+            st = entry.stat()
+        except OSError:
+            continue
+        stats[script_name] = st
+        cached = cache.get(entry.path)
+        if not (cached and cached.get('mtime_ns') == st.st_mtime_ns and cached.get('size') == st.st_size):
+            to_parse[script_name] = entry.path
+    
+    if len(to_parse) >= SCRIPT_PARALLEL_MIN:
+        with ThreadPoolExecutor(max_workers=min(SCRIPT_WORKERS, len(to_parse))) as executor:
+            parsed = dict(zip(to_parse, executor.map(_read_script_meta, to_parse, to_parse.values())))
+    else:
+        parsed = {name: _read_script_meta(name, path) for name, path in to_parse.items()}
+    
+    # Phase 3: merge in directory/name order (first path wins)
+    for entry in candidates:
+        filename = entry.name
+        script_name = filename[:-3]  # Remove .py
+        
+        # Skip if already discovered (first path wins)
+        if script_name in registry:
+            continue
             
-            # Priority 3: Docstring fallback
-            fallback = parse_docstring_fallback(content)
-            registry[script_name] = {
-                'description': fallback.get('description', ''),
-                'params': {},  # Cannot extract params from basic docstring
-                'file': script_path,
-                'category': _categorize_script(script_name)
-            }
+        script_path = entry.path
+        
+        # Priority 1: External config
+        if script_name in external_config:
+            meta = external_config[script_name].copy()
+            meta.setdefault('file', script_path)
+            meta['params'] = _normalize_params(meta.get('params', {}))
+            registry[script_name] = meta
+            continue
+        
+        # Reuse cached metadata while the file's mtime and size are unchanged
+        try:
+            st = entry.stat()
+        except OSError as e:
+            logger.warning(f"Failed to read {filename}: {e}")
+            continue
+        cached = cache.get(script_path)
+        if cached and cached.get('mtime_ns') == st.st_mtime_ns and cached.get('size') == st.st_size:
+            registry[script_name] = cached['meta']
+            seen[script_path] = cached
+            continue
+        
+        if to_parse.get(script_name) == script_path:
+            meta = parsed[script_name]
+        else:
+            # An earlier file with this name failed to read; parse this one now
+            meta = _read_script_meta(script_name, script_path)
+        if meta is None:
+            continue
+        
+        registry[script_name] = meta
+        if _json_stable(meta):
+            seen[script_path] = {'mtime_ns': st.st_mtime_ns, 'size': st.st_size, 'meta': meta}
+        dirty = True
+    
+    # Rewrite only when something was parsed or a cached script disappeared
+    if dirty or len(seen) != len(cache):
+        _save_script_cache(seen)
     
     return registry
 
 
+_PARAM_KEYS = {'type', 'desc', 'required'}
+
+
 def _normalize_params(params: Any) -> Dict[str, Dict[str, Any]]:
     """Normalize params to standard format."""
     if not params or not isinstance(params, dict):
         return {}
+    
+    # Already canonical (exactly type/desc/required each): nothing to rebuild
+    if all(isinstance(info, dict) and info.keys() == _PARAM_KEYS for info in params.values()):
+        return params
         
     normalized = {}
     for name, info in params.items():
@@ -317,19 +557,22 @@ def _normalize_params(params: Any) -> Dict[str, Dict[str, Any]]:
     return normalized
 
 
+# Name prefix -> category, checked before the exact-name table
+_CATEGORY_PREFIXES = (('lock_', 'lock'), ('net_', 'network'))
+# Known script name -> category
+_CATEGORY_BY_NAME = {
+    **dict.fromkeys(('memory', 'slab_dump', 'leak_scan'), 'memory'),
+    **dict.fromkeys(('stack_trace', 'panic_info', 'hung_task', 'task_list', 'cpu_irq_stack'), 'analysis'),
+    **dict.fromkeys(('struct_inspect', 'address_detect', 'list_traversal', 'rbtree_traversal'), 'inspection'),
+}
+
+
 def _categorize_script(name: str) -> str:
     """Heuristic categorization based on script name."""
-    if name.startswith('lock_'):
-        return 'lock'
-    if name.startswith('net_'):
-        return 'network'
-    if name in ['memory', 'slab_dump', 'leak_scan']:
-        return 'memory'
-    if name in ['stack_trace', 'panic_info', 'hung_task', 'task_list', 'cpu_irq_stack']:
-        return 'analysis'
-    if name in ['struct_inspect', 'address_detect', 'list_traversal', 'rbtree_traversal']:
-        return 'inspection'
-    return 'utility'
+    for prefix, category in _CATEGORY_PREFIXES:
+        if name.startswith(prefix):
+            return category
+    return _CATEGORY_BY_NAME.get(name, 'utility')
 
 
 # =============================================================================
@@ -344,23 +587,58 @@ def load_script(script_name: str) -> str:
         raise FileNotFoundError(f"Script '{script_name}' not found in registry")
         
     path = registry[script_name].get('file')
-    if not path or not os.path.exists(path):
+    if not path:
         raise FileNotFoundError(f"Script file for '{script_name}' not found at {path}")
     
+    try:
+        # One stat per call; content is re-read only when the file changed
+        st = os.stat(path)
+        return _read_script_cached(path, st.st_mtime_ns, st.st_size)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Script file for '{script_name}' not found at {path}") from None
+
+
+@functools.lru_cache(maxsize=128)
+def _read_script_cached(path: str, mtime_ns: int, size: int) -> str:
+    """Script content keyed by (path, mtime, size) so edits invalidate it."""
     with open(path, 'r', encoding='utf-8') as f:
         return f.read()
 
 
+def _registry_signature() -> tuple:
+    """mtimes of the script directories and scripts.yaml.
+    
+    A directory's mtime changes when scripts are added, removed or renamed,
+    so a few stats tell whether the cached registry is stale. In-place edits
+    to a script's metadata still need refresh_script_registry().
+    """
+    from crash_mcp.config import Config
+    
+    paths = [p.strip() for p in (Config.DRGN_SCRIPTS_PATH or "").split(":") if p.strip()]
+    paths.append(get_scripts_config_path())
+    signature = []
+    for path in paths:
+        try:
+            signature.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
+
+
 def get_script_registry() -> Dict[str, Dict[str, Any]]:
-    """Get the complete script registry (cached on first call)."""
-    if not hasattr(get_script_registry, '_cache'):
+    """Get the complete script registry (rediscovered when script dirs change)."""
+    signature = _registry_signature()
+    if getattr(get_script_registry, '_signature', None) != signature or not hasattr(get_script_registry, '_cache'):
         get_script_registry._cache = discover_scripts()
+        get_script_registry._signature = signature
         logger.info(f"Discovered {len(get_script_registry._cache)} analysis scripts")
     return get_script_registry._cache
 
 
 def refresh_script_registry() -> Dict[str, Dict[str, Any]]:
-    """Force refresh the script registry."""
+    """Force refresh the script registry (in-memory and on-disk caches)."""
     if hasattr(get_script_registry, '_cache'):
         del get_script_registry._cache
+    _clear_script_cache()
+    _read_script_cached.cache_clear()
     return get_script_registry()
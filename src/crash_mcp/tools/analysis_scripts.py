@@ -1,6 +1,6 @@
 """Analysis Scripts Tool - Execute predefined drgn analysis scripts."""
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from mcp.server.fastmcp import FastMCP
 
 from crash_mcp.tools.utils import json_response, get_session
@@ -24,6 +24,40 @@ def _get_script_registry() -> Dict[str, Dict[str, Any]]:
     return get_script_registry()
 
 
+# Per-script param lookups derived from the registry object they were built
+# from: (registry, {script: (param_types, required_params, int_params)}, available_names)
+_param_index_cache: tuple = (None, {}, "")
+
+
+def _get_param_index(
+    registry: Dict[str, Dict[str, Any]]
+) -> Tuple[Dict[str, Tuple[Dict[str, Optional[str]], Tuple[str, ...], Tuple[str, ...]]], str]:
+    """
+    Flatten each script's params into a name -> type dict and ordered tuples
+    of required and int-typed names, plus the "Available: ..." list for errors.
+    
+    Rebuilt only when get_script_registry() hands out a new registry.
+    """
+    global _param_index_cache
+    cached_registry, index, available = _param_index_cache
+    if cached_registry is not registry:
+        index = {}
+        for name, meta in registry.items():
+            params = {k: v for k, v in meta.get("params", {}).items() if isinstance(v, dict)}
+            index[name] = (
+                {k: v.get("type") for k, v in params.items()},
+                tuple(k for k, v in params.items() if v.get("required")),
+                tuple(k for k, v in params.items() if v.get("type") == "int"),
+            )
+        available = ", ".join(sorted(registry.keys()))
+        _param_index_cache = (registry, index, available)
+    return index, available
+
+
+# list_analysis_scripts responses for one registry object: (registry, {category: json})
+_list_response_cache: tuple = (None, {})
+
+
 def _convert_param_for_injection(key: str, value: Any, expected_type: Optional[str] = None) -> str:
     """
     Convert a parameter value to its Python code representation.
@@ -65,31 +99,27 @@ def _convert_param_for_injection(key: str, value: Any, expected_type: Optional[s
 def _build_script_with_params(
     script_name: str, 
     params: Optional[Dict[str, Any]],
-    param_meta: Optional[Dict[str, Dict[str, Any]]] = None
+    param_types: Optional[Dict[str, Optional[str]]] = None
 ) -> str:
     """
     Build executable script by prepending parameter assignments.
     
-    Intelligently handles type conversion based on param metadata and format detection.
+    Intelligently handles type conversion based on param types and format detection.
     """
     script_content = load_script(script_name)
     
     if not params:
         return script_content
     
-    param_meta = param_meta or {}
-    
-    # Build parameter injection lines with intelligent type conversion
-    param_lines = []
-    for key, value in params.items():
-        expected_type = param_meta.get(key, {}).get("type")
-        param_lines.append(_convert_param_for_injection(key, value, expected_type))
-    
-    if param_lines:
-        prefix = "\n".join(param_lines) + "\n\n"
-        return prefix + script_content
+    param_types = param_types or {}
     
-    return script_content
+    # Build parameter injection lines with intelligent type conversion, then
+    # a blank line and the script, joined in one pass (params is non-empty)
+    lines = [_convert_param_for_injection(key, value, param_types.get(key))
+             for key, value in params.items()]
+    lines.append("")
+    lines.append(script_content)
+    return "\n".join(lines)
 
 
 # =============================================================================
@@ -106,10 +136,10 @@ def run_analysis_script(
     Use list_analysis_scripts() to see available scripts and parameters.
     """
     registry = _get_script_registry()
+    param_index, available = _get_param_index(registry)
     
     # Validate script name
     if script_name not in registry:
-        available = ", ".join(sorted(registry.keys()))
         return json_response("error", error=f"Unknown script: '{script_name}'. Available: {available}")
     
     # Get session
@@ -120,29 +150,33 @@ def run_analysis_script(
     
     # Validate required parameters
     script_meta = registry[script_name]
+    param_types, required_params, int_params = param_index[script_name]
     params = params or {}
-    injected_params = params.copy()
+    # Copied only if a conversion below needs to change a value
+    injected_params = params
     
-    for param_name, param_info in script_meta.get("params", {}).items():
-        # 1. Check required
-        if param_info.get("required") and param_name not in params:
-            return json_response("error", error=f"Missing required parameter: '{param_name}' ({param_info.get('desc', '')})")
-            
-        # 2. Type Conversion (str -> int for hex/dec)
-        if param_name in params:
-            val = params[param_name]
-            expected_type = param_info.get("type")
-            
-            if expected_type == "int" and isinstance(val, str):
-                try:
-                    # Auto-detect base (0x for hex)
-                    injected_params[param_name] = int(val, 0)
-                except ValueError:
-                    return json_response("error", error=f"Invalid int value for '{param_name}': '{val}'")
+    # 1. Check required
+    for param_name in required_params:
+        if param_name not in params:
+            desc = script_meta["params"][param_name].get('desc', '')
+            return json_response("error", error=f"Missing required parameter: '{param_name}' ({desc})")
+    
+    # 2. Type Conversion (str -> int for hex/dec), only for int-typed params
+    for param_name in int_params:
+        val = params.get(param_name)
+        if isinstance(val, str):
+            try:
+                # Auto-detect base (0x for hex)
+                converted = int(val, 0)
+                if injected_params is params:
+                    injected_params = dict(params)
+                injected_params[param_name] = converted
+            except ValueError:
+                return json_response("error", error=f"Invalid int value for '{param_name}': '{val}'")
     
     try:
-        # Build script with injected parameters (pass param metadata for type hints)
-        full_script = _build_script_with_params(script_name, injected_params, script_meta.get("params", {}))
+        # Build script with injected parameters (pass param types for type hints)
+        full_script = _build_script_with_params(script_name, injected_params, param_types)
         
         # Execute via drgn session
         output = session.execute_command(f"drgn:{full_script}", truncate=False)
@@ -163,7 +197,17 @@ def run_analysis_script(
 def list_analysis_scripts(category: Optional[str] = None) -> str:
     """List available analysis scripts with descriptions and parameters.
     """
+    global _list_response_cache
     registry = _get_script_registry()
+    
+    # The response only depends on the registry and category
+    cached_registry, responses = _list_response_cache
+    if cached_registry is not registry:
+        responses = {}
+        _list_response_cache = (registry, responses)
+    elif category in responses:
+        return responses[category]
+    
     scripts_info = []
     
     for name, meta in sorted(registry.items()):
@@ -186,7 +230,9 @@ def list_analysis_scripts(category: Optional[str] = None) -> str:
                 }
         scripts_info.append(script_info)
     
-    return json_response("success", {"scripts": scripts_info, "total": len(scripts_info)})
+    response = json_response("success", {"scripts": scripts_info, "total": len(scripts_info)})
+    responses[category] = response
+    return response
 
 
 # =============================================================================
@@ -1,15 +1,134 @@
 """Crash Info Tool - Get pre-diagnosis information via external script."""
+import os
+import re
+import mmap
+import shlex
+import signal
 import logging
+import functools
 import subprocess
 import json
-from typing import Optional
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
 from mcp.server.fastmcp import FastMCP
 
+import crash_mcp.context as context
 from crash_mcp.config import Config
 from crash_mcp.tools.utils import json_response, get_session
 
 logger = logging.getLogger("crash-mcp")
 
+# Parsed findings shared across sessions, keyed by the command line and the
+# (path, mtime, size) of vmcore/vmlinux. The report is deterministic for a
+# given dump, so a restarted session on the same files skips the script.
+_CRASH_INFO_CACHE_MAX = 16
+_CRASH_INFO_CACHE: "OrderedDict[tuple, dict]" = OrderedDict()
+_CRASH_INFO_LOCK = threading.Lock()
+
+
+def _crash_info_key(cmd_str: str, vmcore_path: str, vmlinux_path: str) -> Optional[tuple]:
+    """Cache key for a report, or None if either file cannot be stat'ed."""
+    try:
+        keys = []
+        for path in (vmcore_path, vmlinux_path):
+            st = os.stat(path)
+            keys.append((path, st.st_mtime_ns, st.st_size))
+    except OSError:
+        return None
+    return (cmd_str, *keys)
+
+
+# Characters that need a real shell (pipes, redirects, expansion, globbing,
+# comments, brace expansion...)
+_SHELL_CHARS = frozenset('|&;<>()$`*?[~!#{}\'"\\\n')
+
+# Leading NAME=value environment assignment (also needs the shell)
+_ENV_ASSIGN_RE = re.compile(r'[A-Za-z_][A-Za-z0-9_]*=')
+
+
+@functools.cache
+def _split_template(cmd_template: str) -> Optional[List[str]]:
+    """
+    Tokenize GET_DUMPINFO_SCRIPT once for direct exec, or None if it uses
+    shell syntax (or a leading VAR=value) and must go through /bin/sh.
+    """
+    bare = cmd_template.replace("{vmcore}", "").replace("{vmlinux}", "")
+    if _SHELL_CHARS.intersection(bare):
+        return None
+    tokens = cmd_template.split()
+    if not tokens or _ENV_ASSIGN_RE.match(tokens[0]):
+        return None
+    return tokens
+
+
+def _build_command(cmd_template: str, vmcore_path: str, vmlinux_path: str) -> Union[List[str], str]:
+    """argv for direct exec when possible, else the formatted shell string."""
+    tokens = _split_template(cmd_template)
+    if tokens is None:
+        return cmd_template.format(vmcore=vmcore_path, vmlinux=vmlinux_path)
+    # Substituting per token keeps paths with spaces as single arguments
+    return [t.format(vmcore=vmcore_path, vmlinux=vmlinux_path) for t in tokens]
+
+
+def _run_script(cmd: Union[List[str], str], timeout: float) -> subprocess.CompletedProcess:
+    """
+    Run the command like subprocess.run(capture_output=True, text=True).
+    
+    A str goes through the shell. The process runs in its own process group
+    and the whole group is killed on timeout; otherwise a grandchild holding
+    stdout/stderr open keeps communicate() blocked long after the shell
+    itself was killed. A direct exec that cannot start reports exit status
+    127/126 like the shell would, instead of raising.
+    """
+    try:
+        proc = subprocess.Popen(cmd, shell=isinstance(cmd, str), stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                text=True, start_new_session=True)
+    except FileNotFoundError as e:
+        return subprocess.CompletedProcess(cmd, 127, "", f"{cmd[0]}: command not found ({e.strerror})")
+    except PermissionError as e:
+        return subprocess.CompletedProcess(cmd, 126, "", f"{cmd[0]}: {e.strerror}")
+    with proc:
+        try:
+            stdout, stderr = proc.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except OSError:
+                pass
+            proc.communicate()
+            raise
+    return subprocess.CompletedProcess(proc.args, proc.returncode, stdout, stderr)
+
+
+def _prepare_command(cmd_template: str, vmcore_path: str,
+                     vmlinux_path: str) -> Tuple[Union[List[str], str], str, Optional[tuple]]:
+    """(command to run, its display string, process cache key) for a dump."""
+    cmd = _build_command(cmd_template, vmcore_path, vmlinux_path)
+    cmd_str = cmd if isinstance(cmd, str) else shlex.join(cmd)
+    return cmd, cmd_str, _crash_info_key(cmd_str, vmcore_path, vmlinux_path)
+
+
+def _lookup_findings(key: Optional[tuple]) -> Optional[dict]:
+    if key is None:
+        return None
+    with _CRASH_INFO_LOCK:
+        findings = _CRASH_INFO_CACHE.get(key)
+        if findings is not None:
+            _CRASH_INFO_CACHE.move_to_end(key)
+    return findings
+
+
+def _cache_findings(key: Optional[tuple], findings: dict):
+    if key is None:
+        return
+    with _CRASH_INFO_LOCK:
+        _CRASH_INFO_CACHE[key] = findings
+        _CRASH_INFO_CACHE.move_to_end(key)
+        while len(_CRASH_INFO_CACHE) > _CRASH_INFO_CACHE_MAX:
+            _CRASH_INFO_CACHE.popitem(last=False)
+
 
 def get_crash_info(session_id: Optional[str] = None, timeout: int = 300) -> str:
     """Get automated crash diagnosis report.
@@ -25,34 +144,54 @@ def get_crash_info(session_id: Optional[str] = None, timeout: int = 300) -> str:
     if not cmd_template:
         return json_response("error", error="GET_DUMPINFO_SCRIPT not configured")
     
+    cmd_name = "get_crash_info"
+    
+    # Process-wide cache first (covers restarted sessions on the same dump).
+    # The paths come from session_manager's metadata, so a hit needs neither
+    # the live session nor its liveness probe.
+    target_id = session_id or context.sessions.last_id
+    info = context.session_manager.get_session(target_id) if target_id else None
+    if info is not None:
+        _, _, cache_key = _prepare_command(cmd_template, info.vmcore_path, info.vmlinux_path or '')
+        findings = _lookup_findings(cache_key)
+        if findings is not None:
+            logger.info(f"Process cache hit for {cmd_name}")
+            return json_response("success", {
+                "findings": findings,
+                "cached": True
+            })
+    
     # Get session for vmcore/vmlinux paths
     try:
         target_id, session = get_session(session_id)
     except ValueError as e:
         return json_response("error", error=str(e))
     
-    # Get session for vmcore/vmlinux paths
     vmcore_path = getattr(session, 'dump_path', '')
     vmlinux_path = getattr(session, 'kernel_path', '')
+    cmd, cmd_str, cache_key = _prepare_command(cmd_template, vmcore_path, vmlinux_path)
     
-    cmd_str = cmd_template.format(
-        vmcore=vmcore_path,
-        vmlinux=vmlinux_path
-    )
+    # Sessions unknown to session_manager get their process cache check here
+    if info is None:
+        findings = _lookup_findings(cache_key)
+        if findings is not None:
+            logger.info(f"Process cache hit for {cmd_name}")
+            return json_response("success", {
+                "findings": findings,
+                "cached": True
+            })
     
-    cmd_name = "get_crash_info"
-    
-    # Check cache first
+    # Then this session's command store
     if session and session.command_store:
         cached = session.command_store.get_cached("script", cmd_name, {})
         if cached:
             if cached.output_file and cached.output_file.exists():
                 try:
-                    output = cached.output_file.read_text()
-                    findings = _parse_report(output)
+                    findings = _parse_report_file(cached.output_file)
                     
                     if findings and "parse_error" not in findings:
                         logger.info(f"Cache hit for {cmd_name}")
+                        _cache_findings(cache_key, findings)
                         return json_response("success", {
                             "findings": findings,
                             "cached": True
@@ -63,13 +202,7 @@ def get_crash_info(session_id: Optional[str] = None, timeout: int = 300) -> str:
     logger.info(f"Executing: {cmd_str}")
     
     try:
-        result = subprocess.run(
-            cmd_str,
-            shell=True,
-            capture_output=True,
-            text=True,
-            timeout=timeout + 60
-        )
+        result = _run_script(cmd, timeout=timeout + 60)
         
         output = result.stdout
         findings = _parse_report(output)
@@ -79,6 +212,9 @@ def get_crash_info(session_id: Optional[str] = None, timeout: int = 300) -> str:
             # Save raw output (stdout)
             session.command_store.save("script", cmd_name, result.stdout, {}, is_error=result.returncode != 0, force_save=True)
         
+        if result.returncode == 0 and "parse_error" not in findings:
+            _cache_findings(cache_key, findings)
+        
         return json_response("success", {
             "findings": findings,
             "stderr": result.stderr[-500:] if result.returncode != 0 and result.stderr else None
@@ -91,15 +227,26 @@ def get_crash_info(session_id: Optional[str] = None, timeout: int = 300) -> str:
         return json_response("error", error=str(e))
 
 
+_REPORT_START = "--- JSON REPORT START ---"
+_REPORT_END = "--- JSON REPORT END ---"
+_REPORT_START_B = _REPORT_START.encode()
+_REPORT_END_B = _REPORT_END.encode()
+
+
 def _parse_report(output: str) -> dict:
     """Parse automated crash report JSON from output."""
-    if "--- JSON REPORT START ---" in output:
+    # One search for the start marker serves as both presence test and offset
+    marker = output.find(_REPORT_START)
+    if marker >= 0:
+        start = marker + len(_REPORT_START)
+        end = output.find(_REPORT_END, start)
+        if end < 0:
+            logger.warning("Failed to parse JSON report: no end marker")
+            return {"parse_error": "no end marker", "raw_output": output[-2000:]}
         try:
-            start = output.index("--- JSON REPORT START ---") + len("--- JSON REPORT START ---")
-            end = output.index("--- JSON REPORT END ---")
-            json_str = output[start:end].strip()
-            return json.loads(json_str)
-        except (ValueError, json.JSONDecodeError, IndexError) as e:
+            return json.loads(output[start:end])
+        except ValueError as e:
+            # json.JSONDecodeError is a ValueError
             logger.warning(f"Failed to parse JSON report: {e}")
             return {"parse_error": str(e), "raw_output": output[-2000:]}
     else:
@@ -107,6 +254,25 @@ def _parse_report(output: str) -> dict:
         return {"raw_output": output[-2000:] if len(output) > 2000 else output}
 
 
+def _parse_report_file(path: Path) -> dict:
+    """
+    _parse_report for a saved report: mmap the file and decode only the JSON
+    between the markers. Anything unusual (no markers, bad JSON, empty file)
+    falls back to reading the text so results match _parse_report exactly.
+    """
+    try:
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            marker = mm.find(_REPORT_START_B)
+            if marker >= 0:
+                start = marker + len(_REPORT_START_B)
+                end = mm.find(_REPORT_END_B, start)
+                if end >= 0:
+                    return json.loads(mm[start:end])
+    except (OSError, ValueError):
+        pass
+    return _parse_report(path.read_text())
+
+
 def register(mcp: FastMCP):
     """Conditionally register get_crash_info tool based on env config."""
     from crash_mcp.tools.tool_logging import logged_tool
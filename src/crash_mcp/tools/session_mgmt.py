@@ -1,9 +1,15 @@
 """Session management tools for crash-mcp."""
 import os
 import re
+import stat
+import time
+import heapq
 import logging
 import datetime
+import threading
 import subprocess
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 from mcp.server.fastmcp import FastMCP, Context
 
@@ -16,17 +22,27 @@ import crash_mcp.context as context
 
 logger = logging.getLogger("crash-mcp")
 
-
-
+# list_crash_dumps results: search_path -> (monotonic timestamp, response)
+_DUMPS_CACHE: dict[str, tuple[float, str]] = {}
+_DUMPS_CACHE_LOCK = threading.Lock()
 
 
 def _format_command_response(result: CommandResult, max_lines: int, override_output: str = None) -> str:
     """Format command response with truncation and state info."""
     # Read content from file or memory
+    total = None
     if override_output is not None:
         lines = override_output.splitlines()
     elif result.output_file and result.output_file.exists():
-        lines = result.output_file.read_text().splitlines()
+        # Read only max_lines + 1 lines (enough to detect truncation); the
+        # total comes from CommandStore, or from counting the rest as it streams
+        with result.output_file.open('r') as f:
+            lines = [line.rstrip('\n') for line in islice(f, max_lines + 1)]
+            if len(lines) > max_lines:
+                if result.total_lines > max_lines:
+                    total = result.total_lines
+                else:
+                    total = len(lines) + sum(1 for _ in f)
     elif result.output_content is not None:
         lines = result.output_content.splitlines()
     else:
@@ -36,7 +52,8 @@ def _format_command_response(result: CommandResult, max_lines: int, override_out
             "command_id": result.command_id,
             "state": {"total_lines": result.total_lines, "truncated": False},
         })
-    total = len(lines)
+    if total is None:
+        total = len(lines)
     
     if total <= max_lines:
         return json_response("success", {
@@ -64,21 +81,33 @@ def _format_command_response(result: CommandResult, max_lines: int, override_out
 def list_crash_dumps(search_path: str = Config.CRASH_SEARCH_PATH) -> str:
     """Scan for vmcore files. Returns paths and modification times of recent dumps."""
     logger.info(f"Listing crash dumps in {search_path}")
+    
+    # Repeat calls within DUMP_CACHE_TTL reuse the formatted response
+    now = time.monotonic()
+    with _DUMPS_CACHE_LOCK:
+        cached = _DUMPS_CACHE.get(search_path)
+    if cached and now - cached[0] < Config.DUMP_CACHE_TTL:
+        return cached[1]
+    
     try:
         dumps = CrashDiscovery.find_dumps([search_path])
         
         if not dumps:
-            return json_response("success", [])
-        
-        dumps.sort(key=lambda x: x['modified'], reverse=True)
-        dumps = dumps[:10]
+            response = json_response("success", [])
+        else:
+            dumps = heapq.nlargest(10, dumps, key=lambda x: x['modified'])
+                
+            result = []
+            for d in dumps:
+                mod_time = datetime.datetime.fromtimestamp(d['modified']).strftime('%Y-%m-%d %H:%M')
+                result.append({"path": d['path'], "modified": mod_time})
             
-        result = []
-        for d in dumps:
-            mod_time = datetime.datetime.fromtimestamp(d['modified']).strftime('%Y-%m-%d %H:%M')
-            result.append({"path": d['path'], "modified": mod_time})
+            response = json_response("success", result)
         
-        return json_response("success", result)
+        if Config.DUMP_CACHE_TTL > 0:
+            with _DUMPS_CACHE_LOCK:
+                _DUMPS_CACHE[search_path] = (now, response)
+        return response
     except Exception as e:
         logger.error(f"Error in list_crash_dumps: {e}", exc_info=True)
         return json_response("error", error=f"Error scanning for dumps: {str(e)}")
@@ -94,27 +123,38 @@ def open_vmcore_session(ctx: Context, vmcore_path: str, vmlinux_path: str,
     
     args_list = crash_args.split(',') if crash_args else []
     
-    # Validation
-    if not ssh_host and not os.path.exists(vmcore_path):
-        return json_response("error", error=f"Dump file not found locally at {vmcore_path} and no remote host specified.")
-
-    # Check version match
-    version_warning = ""
-    if not ssh_host and os.path.exists(vmcore_path) and os.path.exists(vmlinux_path):
+    # Validation: a single stat answers both "exists" and "is a regular file"
+    if not ssh_host:
+        try:
+            st = os.stat(vmcore_path)
+        except OSError:
+            return json_response("error", error=f"Dump file not found locally at {vmcore_path} and no remote host specified.")
+        if not stat.S_ISREG(st.st_mode):
+            return json_response("error", error=f"Dump path {vmcore_path} is not a regular file.")
+
+    # Check version match. Header parsing is independent of the session
+    # lookup below (which hashes the vmcore), so run it on a worker meanwhile.
+    version_future = None
+    if not ssh_host and os.path.exists(vmlinux_path):
         ctx.report_progress(10, 100, "Checking kernel version match")
-        match_result = CrashDiscovery.check_version_match(vmcore_path, vmlinux_path)
-        if not match_result.get('match') and match_result.get('vmcore_version'):
-            version_warning = match_result['message']
+        executor = ThreadPoolExecutor(max_workers=1)
+        version_future = executor.submit(CrashDiscovery.check_version_match, vmcore_path, vmlinux_path)
+        executor.shutdown(wait=False)
 
     # Use SessionManager for deduplication
     ctx.report_progress(15, 100, "Checking existing sessions")
     session_id, info, is_new = context.session_manager.get_or_create(vmcore_path, vmlinux_path)
     
+    version_warning = ""
+    if version_future is not None:
+        match_result = version_future.result()
+        if not match_result.get('match') and match_result.get('vmcore_version'):
+            version_warning = match_result['message']
+    
     if not is_new:
         # Session already exists for this vmcore
-        if session_id in context.sessions:
+        if context.sessions.set_default(session_id):
             context.session_manager.acquire(session_id)  # Increment ref count
-            context.last_session_id = session_id
             result = {
                 "session_id": session_id,
             }
@@ -144,9 +184,8 @@ def open_vmcore_session(ctx: Context, vmcore_path: str, vmlinux_path: str,
             
         session.start(on_progress=on_progress_cb)
         
-        context.sessions[session_id] = session
+        context.sessions.put(session_id, session)
         context.session_manager.acquire(session_id)  # Increment ref count
-        context.last_session_id = session_id
         
         result = {
             "session_id": session_id,
@@ -344,25 +383,25 @@ def close_vmcore_session(session_id: Optional[str] = None) -> str:
     Args:
         session_id: Session to close (uses last session if omitted)
     """
-    try:
-        target_id, session = get_session(session_id)
-    except ValueError as e:
-        return json_response("error", error=str(e))
+    target_id = session_id or context.sessions.last_id
+    if not target_id:
+        return json_response("error", error="No session specified and no active default session.")
     
-    # Release reference
+    # Release reference first; the session object is only needed on last release
     ref_count = context.session_manager.release(target_id)
+    if ref_count < 0:
+        return json_response("error", error=f"Session ID {target_id} not found.")
     
     if ref_count > 0:
         # Other references exist, session stays active
         return json_response("success", {"message": "Session released"})
     
     # No more references, actually close the session
-    session.stop()
-    del context.sessions[target_id]
+    # pop() also clears the default if it pointed at this session
+    session = context.sessions.pop(target_id)
+    if session is not None:
+        session.stop()
     context.session_manager.remove_session(target_id)
-    
-    if context.last_session_id == target_id:
-        context.last_session_id = None
         
     return json_response("success", {"message": "Session closed"})
 
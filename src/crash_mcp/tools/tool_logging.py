@@ -3,6 +3,7 @@
 Provides a wrapper to log all tool calls with input/output to workdir.
 """
 import functools
+import inspect
 import json
 import logging
 import time
@@ -78,16 +79,17 @@ def logged_tool(func: Callable) -> Callable:
         def my_tool(arg1, arg2):
             ...
     """
+    # Resolved once at wrap time rather than on every call
+    tool_name = func.__name__
+    params = list(inspect.signature(func).parameters.keys())
+    
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        tool_name = func.__name__
+        if not Config.LOG_TOOL_CALLS:
+            return func(*args, **kwargs)
         
         # Build args dict for logging (skip Context objects)
         logged_args = {}
-        import inspect
-        sig = inspect.signature(func)
-        params = list(sig.parameters.keys())
-        
         for i, arg in enumerate(args):
             if i < len(params):
                 param_name = params[i]
@@ -6,24 +6,60 @@ from typing import Optional, Tuple
 import crash_mcp.context as context
 from crash_mcp.common.unified_session import UnifiedSession
 
+# Optional: orjson encodes large string payloads several times faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger("crash-mcp")
 
 
+def _nan_to_none(value):
+    """Copy of `value` with NaN/Infinity floats replaced by None (as orjson does)."""
+    if isinstance(value, float):
+        return None if value != value or value in (float('inf'), float('-inf')) else value
+    if isinstance(value, dict):
+        return {k: _nan_to_none(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_nan_to_none(v) for v in value]
+    return value
+
+
+def _json_dumps(response: dict) -> str:
+    """Stdlib encoding with the same output as the orjson path."""
+    try:
+        return json.dumps(response, ensure_ascii=False, separators=(",", ":"), allow_nan=False)
+    except ValueError:
+        # NaN/Infinity are not valid JSON; emit null like orjson
+        return json.dumps(_nan_to_none(response), ensure_ascii=False, separators=(",", ":"), allow_nan=False)
+
+
 def json_response(status: str, result=None, error=None) -> str:
-    """Format JSON response for tool output."""
+    """Format JSON response for tool output.
+    
+    Compact separators and NaN/Infinity as null, whether or not orjson is
+    installed, so the output does not depend on the environment.
+    """
     response = {"status": status}
     if result is not None:
         response["result"] = result
     if error is not None:
         response["error"] = error
-    return json.dumps(response, ensure_ascii=False)
+    if orjson is not None:
+        try:
+            return orjson.dumps(response, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            # e.g. ints beyond 64 bits or unsupported types; json handles them
+            pass
+    return _json_dumps(response)
 
 
 def get_session(session_id: Optional[str] = None) -> Tuple[str, UnifiedSession]:
     """Get session by ID or use last session.
     
     Args:
-        session_id: Optional session ID. If None, uses last_session_id.
+        session_id: Optional session ID. If None, uses the default session.
         
     Returns:
         Tuple of (session_id, session)
@@ -31,18 +67,15 @@ def get_session(session_id: Optional[str] = None) -> Tuple[str, UnifiedSession]:
     Raises:
         ValueError: If session not found or not active.
     """
-    target_id = session_id or context.last_session_id
-    
-    if not target_id:
-        raise ValueError("No session specified and no active default session.")
-    
-    if target_id not in context.sessions:
-        raise ValueError(f"Session ID {target_id} not found.")
+    target_id, session = context.sessions.get(session_id)
     
-    session = context.sessions[target_id]
     if not session.is_active():
-        del context.sessions[target_id]
-        context.session_manager.remove_session(target_id)  # Sync with session_manager
+        # Only the caller that actually removed it syncs session_manager
+        if context.sessions.pop(target_id, session) is not None:
+            # Dead engines are never close()d; keep pending manifest entries
+            if session.command_store:
+                session.command_store.flush()
+            context.session_manager.remove_session(target_id)
         raise ValueError("Session is no longer active.")
     
     return target_id, session
@@ -29,6 +29,15 @@ def mock_drgn_path():
     return str(MOCK_DRGN_PATH)
 
 
+@pytest.fixture(autouse=True)
+def isolated_script_cache(tmp_path, monkeypatch):
+    """Keep script discovery from writing the user's ~/.cache/crash-mcp/scripts.json."""
+    import dataclasses
+    import crash_mcp.config as config
+    monkeypatch.setattr(config, "Config", dataclasses.replace(
+        config.Config, SCRIPT_CACHE_PATH=str(tmp_path / "script-cache" / "scripts.json")))
+
+
 @pytest.fixture
 def temp_workdir(tmp_path):
     """Create a temporary working directory."""
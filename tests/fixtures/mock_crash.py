@@ -49,6 +49,9 @@ def main():
                 print("     VERSION: #1 SMP PREEMPT_DYNAMIC Tue Oct 10 00:00:00 UTC 2023")
                 print("     MACHINE: x86_64  (2000 Mhz)")
                 print("      MEMORY: 8 GB")
+            elif cmd.startswith('big '):
+                # Large output for streaming/truncation tests: "big N" prints N lines
+                sys.stdout.write("".join(f"line {i}\n" for i in range(int(cmd.split()[1]))))
             elif cmd:
                 print(f"mock output for: {cmd}")
                 
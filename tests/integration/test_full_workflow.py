@@ -9,7 +9,7 @@ class TestFullWorkflow:
 
     def test_discovery_to_session_flow(self, tmp_path):
         """Test discovering dumps and matching kernels."""
-        from crash_mcp.discovery import CrashDiscovery
+        from crash_mcp.common.vmcore_discovery import CrashDiscovery
         
         # Create mock crash dump structure
         crash_dir = tmp_path / "var" / "crash" / "127.0.0.1-2024-01-01"
@@ -91,3 +91,71 @@ line 5: normal"""
         # Different context = different command_id
         assert result1.command_id != result2.command_id
         assert "@pid=" in result1.command_id
+
+    def test_manifest_flush(self, temp_workdir):
+        """Test deferred manifest writes are persisted by flush()."""
+        store = CommandStore(temp_workdir)
+        store.save("crash", "sys", "first", {}, force_save=True)
+        store.save("crash", "ps", "second", {}, force_save=True)
+        store.flush()
+        
+        reloaded = CommandStore(temp_workdir)
+        assert len(reloaded._commands) == 2
+        text, _, _, _ = reloaded.get_lines(store.get_cached("crash", "ps", {}).command_id, 0, 10)
+        assert text == "second"
+
+    def test_old_manifest_migrated(self, temp_workdir):
+        """Test unversioned manifests are re-keyed, dropping context-dependent entries."""
+        import json
+        (temp_workdir / "0001_sys.txt").write_text("system info")
+        (temp_workdir / "0002_bt.txt").write_text("backtrace")
+        old = {
+            "crash:sys:8e3e7a1b": {"command": "sys", "engine": "crash", "output_file": "0001_sys.txt", "total_lines": 1},
+            "crash:bt:1b2c3d4e@a1b2c3": {"command": "bt", "engine": "crash", "output_file": "0002_bt.txt", "total_lines": 1},
+        }
+        (temp_workdir / "manifest.json").write_text(json.dumps(old))
+        
+        store = CommandStore(temp_workdir)
+        cached = store.get_cached("crash", "sys", {})
+        assert cached is not None and cached.output_file.name == "0001_sys.txt"
+        assert len(store._commands) == 1
+        
+        store.flush()
+        data = json.loads((temp_workdir / "manifest.json").read_text())
+        assert list(data["entries"]) == [cached.command_id]
+
+    def test_pending_manifest_flushed_at_exit(self, temp_workdir):
+        """Test entries left dirty (store never flushed) are written by the exit hook."""
+        from crash_mcp.common.command_store import _flush_all_stores
+        store = CommandStore(temp_workdir)
+        store.save("crash", "sys", "first", {}, force_save=True)
+        store.save("crash", "ps", "second", {}, force_save=True)
+        assert store._manifest_dirty
+        
+        _flush_all_stores()
+        assert not store._manifest_dirty
+        assert len(CommandStore(temp_workdir)._commands) == 2
+
+    def test_memory_cache_lru_eviction(self, temp_workdir, monkeypatch):
+        """Test memory-only results are evicted least-recently-used first."""
+        import dataclasses
+        import crash_mcp.config as config
+        monkeypatch.setattr(config, "Config", dataclasses.replace(config.Config, COMMAND_CACHE_MAX_ENTRIES=2))
+        
+        store = CommandStore(temp_workdir)
+        store.save("crash", "sys", "a", {})
+        store.save("crash", "ps", "b", {})
+        assert store.get_cached("crash", "sys", {}) is not None  # refresh 'sys'
+        store.save("crash", "mount", "c", {})
+        
+        assert store.get_cached("crash", "ps", {}) is None
+        assert store.get_cached("crash", "sys", {}) is not None
+        assert store.get_cached("crash", "mount", {}) is not None
+
+    def test_crash_whitespace_normalized(self, temp_workdir):
+        """Test crash commands differing only in whitespace share a cache entry."""
+        store = CommandStore(temp_workdir)
+        store.save("crash", "bt  -a", "backtrace output", {})
+        
+        assert store.get_cached("crash", " bt -a ", {}) is not None
+        assert store.get_cached("drgn", "bt -a", {}) is None
@@ -0,0 +1,80 @@
+"""Test the SessionRegistry used for live sessions."""
+import threading
+
+import pytest
+from crash_mcp.context import SessionRegistry
+
+
+class TestSessionRegistry:
+    """Test suite for SessionRegistry."""
+
+    def test_get_default(self):
+        """Test get() without an id falls back to the last registered session."""
+        registry = SessionRegistry()
+        first, second = object(), object()
+        registry.put("a", first)
+        registry.put("b", second)
+        
+        assert registry.get() == ("b", second)
+        assert registry.get("a") == ("a", first)
+
+    def test_get_errors(self):
+        """Test get() raises for no default and for unknown ids."""
+        registry = SessionRegistry()
+        with pytest.raises(ValueError, match="no active default session"):
+            registry.get()
+        with pytest.raises(ValueError, match="not found"):
+            registry.get("missing")
+
+    def test_pop_clears_default(self):
+        """Test pop() returns the session and clears the default pointing at it."""
+        registry = SessionRegistry()
+        session = object()
+        registry.put("a", session)
+        
+        assert registry.pop("a") is session
+        assert registry.last_id is None
+        assert "a" not in registry
+        assert registry.pop("a") is None
+
+    def test_pop_expected(self):
+        """Test pop(expected) leaves an entry that was replaced by another session."""
+        registry = SessionRegistry()
+        stale, current = object(), object()
+        registry.put("a", current)
+        
+        assert registry.pop("a", stale) is None
+        assert registry.get("a") == ("a", current)
+        assert registry.pop("a", current) is current
+        assert len(registry) == 0
+
+    def test_set_default(self):
+        """Test set_default() only switches to registered sessions."""
+        registry = SessionRegistry()
+        registry.put("a", object())
+        registry.put("b", object())
+        
+        assert registry.set_default("a")
+        assert registry.last_id == "a"
+        assert not registry.set_default("missing")
+        assert registry.last_id == "a"
+
+    def test_concurrent_pop_single_winner(self):
+        """Test only one of several racing pop() calls gets the session."""
+        registry = SessionRegistry()
+        session = object()
+        registry.put("a", session)
+        results = []
+        barrier = threading.Barrier(8)
+        
+        def worker():
+            barrier.wait()
+            results.append(registry.pop("a", session))
+        
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        assert [r for r in results if r is not None] == [session]
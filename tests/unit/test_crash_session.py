@@ -42,3 +42,36 @@ class TestCrashSession:
         assert crash_session.is_active()
         crash_session.close()
         assert not crash_session.is_active()
+
+    def test_large_output_streaming_truncation(self, crash_session):
+        """Test output beyond 2 * STREAM_KEEP_CHARS is cut while reading, with an exact marker."""
+        import re
+        crash_session.start(timeout=5)
+        full = crash_session.execute_command("big 100000", timeout=10, truncate=False)
+        assert len(full) > 2 * crash_session.STREAM_KEEP_CHARS
+        assert full.startswith("line 0\n") and full.endswith("line 99999")
+        
+        output = crash_session.execute_command("big 100000", timeout=10)
+        match = re.search(r"\((\d+) characters skipped\)", output)
+        assert match
+        assert int(match.group(1)) == len(full) - 16384
+        assert output.startswith(full[:4096])
+        assert output.endswith(full[-12288:])
+
+    def test_read_until_prompt_bounded(self, crash_session):
+        """Test bounded reads keep head and tail and account for every dropped char."""
+        crash_session.start(timeout=5)
+        keep = crash_session.STREAM_KEEP_CHARS
+        
+        crash_session._process.sendline("big 100000")
+        unbounded, skipped = crash_session._read_until_prompt(10, bounded=False)
+        assert skipped == 0
+        
+        crash_session._process.sendline("big 100000")
+        bounded, skipped = crash_session._read_until_prompt(10, bounded=True)
+        assert skipped > 0
+        # skipped is counted on CRLF-normalized text, as execute_command reports it
+        assert len(bounded.replace("\r\n", "\n")) + skipped == len(unbounded.replace("\r\n", "\n"))
+        assert len(bounded) >= 2 * keep
+        assert bounded[:keep] == unbounded[:keep]
+        assert bounded[-keep:] == unbounded[-keep:]
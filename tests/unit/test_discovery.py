@@ -1,7 +1,7 @@
 """Test CrashDiscovery functionality."""
 import pytest
 import os
-from crash_mcp.discovery import CrashDiscovery
+from crash_mcp.common.vmcore_discovery import CrashDiscovery
 
 
 class TestCrashDiscovery:
@@ -64,3 +64,74 @@ class TestCrashDiscovery:
         dumps = CrashDiscovery.find_dumps([str(tmp_path)])
         assert len(dumps) == 1
         assert dumps[0]['filename'] == "vmcore"
+
+    def test_find_dumps_multi_pattern_dedup(self, tmp_path):
+        """Test a file matching several patterns is reported once."""
+        subdir = tmp_path / "crash"
+        subdir.mkdir()
+        (subdir / "vmcore.dump").write_text("dump")
+        (subdir / "README").write_text("not a dump")
+        
+        dumps = CrashDiscovery.find_dumps([str(tmp_path)])
+        assert len(dumps) == 1
+        assert dumps[0]['filename'] == "vmcore.dump"
+
+    def test_kernel_version_cache_invalidation(self, tmp_path):
+        """Test cached header parse is refreshed when the dump changes."""
+        import struct
+
+        def write_kdump(path, release):
+            fields = [b"Linux", b"host", release.encode(), b"#1 SMP", b"x86_64", b""]
+            header = b"KDUMP   " + struct.pack("<I", 6)
+            header += b"".join(f.ljust(65, b"\x00") for f in fields)
+            path.write_bytes(header)
+
+        vmcore = tmp_path / "vmcore"
+        write_kdump(vmcore, "5.15.0-generic")
+        assert CrashDiscovery.get_kernel_version_from_dump(str(vmcore)) == "5.15.0-generic"
+        assert CrashDiscovery.get_dump_info(str(vmcore))["hostname"] == "host"
+
+        write_kdump(vmcore, "6.1.0-longer-release")
+        assert CrashDiscovery.get_kernel_version_from_dump(str(vmcore)) == "6.1.0-longer-release"
+
+    def test_find_dumps_multiple_search_paths(self, tmp_path):
+        """Test scanning several (overlapping) search paths."""
+        for name in ("a", "b"):
+            subdir = tmp_path / name
+            subdir.mkdir()
+            (subdir / "vmcore").write_text(f"dump {name}")
+        
+        dumps = CrashDiscovery.find_dumps([str(tmp_path / "a"), str(tmp_path / "b"), str(tmp_path)])
+        assert sorted(d['path'] for d in dumps) == [
+            str(tmp_path / "a" / "vmcore"),
+            str(tmp_path / "b" / "vmcore"),
+        ]
+
+    def test_find_dumps_follows_dir_symlinks(self, tmp_path):
+        """Test symlinked directories are scanned and symlink loops terminate."""
+        root = tmp_path / "root"
+        outside = tmp_path / "outside"
+        root.mkdir()
+        outside.mkdir()
+        (outside / "vmcore").write_text("dump")
+        (root / "link").symlink_to(outside, target_is_directory=True)
+        (outside / "loop").symlink_to(root, target_is_directory=True)
+        
+        dumps = CrashDiscovery.find_dumps([str(root)])
+        assert len(dumps) == 1
+        assert dumps[0]['path'] == str(root / "link" / "vmcore")
+
+    def test_no_kernel_cache_bounded(self, tmp_path, monkeypatch):
+        """Test the negative match_kernel cache evicts least recently used dirs."""
+        from crash_mcp.common import vmcore_discovery
+        monkeypatch.setattr(vmcore_discovery, "_NO_KERNEL_DIRS_MAX", 2)
+        monkeypatch.setattr(vmcore_discovery, "_NO_KERNEL_DIRS", type(vmcore_discovery._NO_KERNEL_DIRS)())
+        dirs = []
+        for name in ("a", "b", "c"):
+            subdir = tmp_path / name
+            subdir.mkdir()
+            (subdir / "vmcore").write_text("dump")
+            dirs.append(str(subdir))
+            assert CrashDiscovery.match_kernel(str(subdir / "vmcore"), []) is None
+        
+        assert list(vmcore_discovery._NO_KERNEL_DIRS) == dirs[1:]
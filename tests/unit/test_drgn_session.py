@@ -47,3 +47,16 @@ class TestDrgnSession:
         drgn_session.start()
         drgn_session.close()
         assert not drgn_session.is_active()
+
+
+def test_strip_echo():
+    """Echo stripping gives the same result on the fast and fallback paths."""
+    from crash_mcp.drgn.session import _strip_echo
+    assert _strip_echo(">>> prog\r\n\r\nCoreDump(prog)\r\n", ["prog"]) == "CoreDump(prog)"
+    # ANSI codes in the echo force the line-by-line fallback
+    assert _strip_echo("\x1b[?2004lprog\r\nCoreDump(prog)\r\n", ["prog"]) == "CoreDump(prog)"
+    # Output that doesn't start with the echo is kept intact
+    assert _strip_echo("Traceback\r\nprog\r\n", ["prog"]) == "Traceback\nprog"
+    # Echo without a prompt, and multi-line input with continuation prompts
+    assert _strip_echo("prog['jiffies']\r\nObject(...)\r\n", ["prog['jiffies']"]) == "Object(...)"
+    assert _strip_echo(">>> f(1,\r\n... 2)\r\n\r\n3\r\n", ["f(1,", "2)"]) == "3"
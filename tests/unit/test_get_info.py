@@ -0,0 +1,68 @@
+"""Test GET_DUMPINFO_SCRIPT command building and execution."""
+import pytest
+
+pytest.importorskip("mcp")
+
+from crash_mcp.tools.get_info import _split_template, _build_command, _run_script
+
+
+class TestBuildCommand:
+    """Test suite for dump-info command construction."""
+
+    def test_plain_template_direct_exec(self):
+        """Test a template without shell syntax becomes an argv list."""
+        assert _build_command("crashinfo -c {vmcore} -k {vmlinux}", "/d/vmcore", "/k/vmlinux") == [
+            "crashinfo", "-c", "/d/vmcore", "-k", "/k/vmlinux"]
+
+    def test_paths_with_spaces_stay_single_args(self):
+        """Test substituted paths containing spaces are not split."""
+        cmd = _build_command("crashinfo {vmcore} {vmlinux}", "/var/crash/my dump/vmcore", "/k/vm linux")
+        assert cmd == ["crashinfo", "/var/crash/my dump/vmcore", "/k/vm linux"]
+
+    @pytest.mark.parametrize("template", [
+        "crashinfo {vmcore} | tee /tmp/out",
+        "crashinfo {vmcore} > /tmp/out 2>&1",
+        "crashinfo $HOME/{vmcore}",
+        "crashinfo '{vmcore}'",
+        "crashinfo {vmcore}; echo done",
+        "crashinfo {vmcore} # note",
+        "crashinfo {vmcore} {{a,b}}",
+    ])
+    def test_shell_chars_use_shell(self, template):
+        """Test templates with shell syntax are formatted as one shell string."""
+        assert _split_template(template) is None
+        assert _build_command(template, "/d/vmcore", "/k/vmlinux") == template.format(
+            vmcore="/d/vmcore", vmlinux="/k/vmlinux")
+
+    @pytest.mark.parametrize("template", ["LANG=C crashinfo {vmcore}", "FOO=1 crashinfo {vmcore}", "_X= crashinfo {vmcore}"])
+    def test_leading_env_assignment_uses_shell(self, template):
+        """Test a leading NAME=value needs the shell to set the environment."""
+        assert _split_template(template) is None
+        assert _build_command(template, "/d/vmcore", "/k/vmlinux") == template.format(vmcore="/d/vmcore")
+
+    def test_option_with_equals_direct_exec(self):
+        """Test '=' outside a leading assignment does not force the shell."""
+        assert _build_command("crashinfo --dump={vmcore}", "/d/vmcore", "/k/vmlinux") == [
+            "crashinfo", "--dump=/d/vmcore"]
+
+    def test_shell_chars_in_paths_do_not_force_shell(self):
+        """Test only the template decides; odd characters in paths stay literal args."""
+        cmd = _build_command("crashinfo {vmcore}", "/d/$weird;name", "/k/vmlinux")
+        assert cmd == ["crashinfo", "/d/$weird;name"]
+
+
+class TestRunScript:
+    """Test suite for running the dump-info command."""
+
+    def test_direct_exec(self):
+        """Test argv commands capture stdout and the exit status."""
+        result = _run_script(["sh", "-c", "echo out; exit 3"], timeout=5)
+        assert result.returncode == 3
+        assert result.stdout == "out\n"
+
+    def test_missing_binary_returns_127(self, tmp_path):
+        """Test a missing executable reports 127 like the shell path does."""
+        result = _run_script([str(tmp_path / "no-such-tool"), "/d/vmcore"], timeout=5)
+        assert result.returncode == 127
+        assert "no-such-tool" in result.stderr
+        assert _run_script(f"{tmp_path / 'no-such-tool'} /d/vmcore", timeout=5).returncode == 127
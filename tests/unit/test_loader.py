@@ -0,0 +1,131 @@
+"""Test script discovery and its on-disk metadata cache."""
+import os
+import json
+import dataclasses
+
+import pytest
+import crash_mcp.config as config
+from crash_mcp.resource import loader
+
+
+SCRIPT = '''"""
+---
+description: {desc}
+---
+"""
+print("hello")
+'''
+
+
+@pytest.fixture
+def scripts_env(tmp_path, monkeypatch):
+    """Point DRGN_SCRIPTS_PATH and SCRIPT_CACHE_PATH at tmp_path; count parses."""
+    scripts_dir = tmp_path / "scripts"
+    scripts_dir.mkdir()
+    cache_path = tmp_path / "cache" / "scripts.json"
+    monkeypatch.setattr(config, "Config", dataclasses.replace(
+        config.Config, DRGN_SCRIPTS_PATH=str(scripts_dir), SCRIPT_CACHE_PATH=str(cache_path)))
+    # Keep a developer's resource/scripts.yaml out of the way
+    monkeypatch.setattr(loader, "load_external_config", lambda: {})
+    
+    parsed = []
+    read_meta = loader._read_script_meta
+    
+    def counting_read(name, path):
+        parsed.append(name)
+        return read_meta(name, path)
+    
+    monkeypatch.setattr(loader, "_read_script_meta", counting_read)
+    monkeypatch.delattr(loader.get_script_registry, "_cache", raising=False)
+    yield scripts_dir, cache_path, parsed
+    if hasattr(loader.get_script_registry, "_cache"):
+        del loader.get_script_registry._cache
+
+
+def write_script(path, desc):
+    path.write_text(SCRIPT.format(desc=desc))
+
+
+class TestScriptCache:
+    """Test suite for the script metadata cache."""
+
+    def test_reuse_when_unchanged(self, scripts_env):
+        """Test a second discovery reuses cached metadata without parsing."""
+        scripts_dir, cache_path, parsed = scripts_env
+        write_script(scripts_dir / "task_list.py", "List tasks")
+        
+        assert loader.discover_scripts()["task_list"]["description"] == "List tasks"
+        assert parsed == ["task_list"]
+        assert cache_path.exists()
+        
+        parsed.clear()
+        assert loader.discover_scripts()["task_list"]["description"] == "List tasks"
+        assert parsed == []
+
+    def test_reparse_on_size_change(self, scripts_env):
+        """Test an edited script (new size) is parsed again."""
+        scripts_dir, _, parsed = scripts_env
+        script = scripts_dir / "task_list.py"
+        write_script(script, "List tasks")
+        loader.discover_scripts()
+        
+        parsed.clear()
+        write_script(script, "List all tasks")
+        assert loader.discover_scripts()["task_list"]["description"] == "List all tasks"
+        assert parsed == ["task_list"]
+
+    def test_reparse_on_mtime_change(self, scripts_env):
+        """Test a touched script (same size, new mtime) is parsed again."""
+        scripts_dir, _, parsed = scripts_env
+        script = scripts_dir / "task_list.py"
+        write_script(script, "List tasks")
+        loader.discover_scripts()
+        
+        parsed.clear()
+        write_script(script, "List jobs!")
+        st = os.stat(script)
+        os.utime(script, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        assert loader.discover_scripts()["task_list"]["description"] == "List jobs!"
+        assert parsed == ["task_list"]
+
+    def test_version_mismatch_ignored(self, scripts_env):
+        """Test a cache written by another format version is not used."""
+        scripts_dir, cache_path, parsed = scripts_env
+        write_script(scripts_dir / "task_list.py", "List tasks")
+        loader.discover_scripts()
+        
+        data = json.loads(cache_path.read_text())
+        data["version"] = loader._SCRIPT_CACHE_VERSION + 1
+        cache_path.write_text(json.dumps(data))
+        assert loader._load_script_cache() == {}
+        
+        parsed.clear()
+        loader.discover_scripts()
+        assert parsed == ["task_list"]
+        assert json.loads(cache_path.read_text())["version"] == loader._SCRIPT_CACHE_VERSION
+
+    def test_json_unstable_meta_not_cached(self, scripts_env):
+        """Test metadata that JSON would change (non-str keys) is re-parsed, not cached."""
+        scripts_dir, cache_path, parsed = scripts_env
+        (scripts_dir / "task_list.py").write_text(
+            '"""\n---\ndescription: List tasks\nparams:\n  1: first positional\n---\n"""\n')
+        
+        first = loader.discover_scripts()["task_list"]
+        assert 1 in first["params"]
+        assert json.loads(cache_path.read_text())["entries"] == {}
+        
+        parsed.clear()
+        assert loader.discover_scripts()["task_list"] == first
+        assert parsed == ["task_list"]
+
+    def test_refresh_clears_cache(self, scripts_env):
+        """Test refresh_script_registry() drops the disk cache and re-parses."""
+        scripts_dir, cache_path, parsed = scripts_env
+        write_script(scripts_dir / "task_list.py", "List tasks")
+        loader.get_script_registry()
+        assert cache_path.exists()
+        
+        parsed.clear()
+        registry = loader.refresh_script_registry()
+        assert registry["task_list"]["description"] == "List tasks"
+        assert parsed == ["task_list"]
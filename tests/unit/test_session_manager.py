@@ -0,0 +1,72 @@
+"""Test SessionManager reference counting."""
+import pytest
+from crash_mcp.common.session_manager import SessionManager
+
+
+@pytest.fixture
+def manager(temp_workdir):
+    return SessionManager(str(temp_workdir))
+
+
+@pytest.fixture
+def vmcore(tmp_path):
+    path = tmp_path / "vmcore"
+    path.write_bytes(b"dump")
+    return str(path)
+
+
+class TestSessionManager:
+    """Test suite for SessionManager."""
+
+    def test_get_or_create_dedup(self, manager, vmcore):
+        """Test the same vmcore maps to the same session."""
+        sid, _, is_new = manager.get_or_create(vmcore)
+        again, _, is_new_again = manager.get_or_create(vmcore)
+        assert is_new and not is_new_again
+        assert again == sid
+
+    def test_acquire_release(self, manager, vmcore):
+        """Test release returns the remaining reference count."""
+        sid, _, _ = manager.get_or_create(vmcore)
+        manager.acquire(sid)
+        manager.acquire(sid)
+        assert manager.release(sid) == 1
+        assert manager.release(sid) == 0
+
+    def test_release_never_acquired(self, manager, vmcore):
+        """Test releasing an entry at ref_count 0 stays at 0 instead of going negative."""
+        sid, _, _ = manager.get_or_create(vmcore)
+        assert manager.release(sid) == 0
+        assert manager.release(sid) == 0
+        assert manager.get_ref_count(sid) == 0
+
+    def test_release_unknown(self, manager):
+        """Test releasing an unknown session reports not found."""
+        assert manager.release("missing") == -1
+
+    def test_remove_session(self, manager, vmcore):
+        """Test removal frees the vmcore for a new session."""
+        sid, _, _ = manager.get_or_create(vmcore)
+        manager.remove_session(sid)
+        assert manager.get_session(sid) is None
+        assert manager.release(sid) == -1
+        new_sid, _, is_new = manager.get_or_create(vmcore)
+        assert is_new and new_sid != sid
+
+    def test_concurrent_acquire_release(self, manager, vmcore):
+        """Test ref counts stay consistent under concurrent acquire/release."""
+        import threading
+        sid, _, _ = manager.get_or_create(vmcore)
+        
+        def worker():
+            for _ in range(1000):
+                manager.acquire(sid)
+                manager.release(sid)
+        
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        assert manager.get_ref_count(sid) == 0
@@ -0,0 +1,31 @@
+"""Test tool response formatting."""
+import pytest
+import crash_mcp.tools.utils as utils
+from crash_mcp.tools.utils import json_response
+
+
+PAYLOADS = [
+    ("success", {"text": "übersicht\\n", "lines": [1, 2.5, None, True]}, None),
+    ("success", {"nan": float("nan"), "inf": [float("inf"), -float("inf")]}, None),
+    ("success", {1: "int key", "nested": {2: "x"}}, None),
+    ("error", None, "Session ID abc not found."),
+]
+
+
+class TestJsonResponse:
+    """Test suite for json_response."""
+
+    def test_stdlib_path(self, monkeypatch):
+        """Test the stdlib fallback emits compact, valid JSON with NaN as null."""
+        monkeypatch.setattr(utils, "orjson", None)
+        assert json_response("success", {"a": [1, 2]}) == '{"status":"success","result":{"a":[1,2]}}'
+        assert json_response("success", {"v": float("nan")}) == '{"status":"success","result":{"v":null}}'
+        assert json_response("success", {"s": "ü"}) == '{"status":"success","result":{"s":"ü"}}'
+
+    @pytest.mark.parametrize("status,result,error", PAYLOADS)
+    def test_orjson_matches_stdlib(self, monkeypatch, status, result, error):
+        """Test both encoders produce identical output."""
+        pytest.importorskip("orjson")
+        fast = json_response(status, result, error)
+        monkeypatch.setattr(utils, "orjson", None)
+        assert json_response(status, result, error) == fast
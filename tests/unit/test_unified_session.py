@@ -62,3 +62,25 @@ class TestUnifiedSessionRouting:
         # Force drgn for crash-like command
         assert unified_session.execute_command("drgn: sys") == "drgn_output"
         unified_session.drgn_session.execute_command.assert_called_with("sys", 60, True)
+
+
+def test_start_forwards_drgn_progress():
+    """Test drgn's start progress (on its worker thread) is reported 50-90% on the caller's thread."""
+    import threading
+    session = UnifiedSession('/tmp/vmcore', '/tmp/vmlinux')
+    session.crash_session.start = MagicMock()
+    session.crash_session.get_default_context = MagicMock(return_value={})
+    
+    def drgn_start(timeout, on_progress=None):
+        on_progress(0, "drgn begin")
+        on_progress(100, "drgn end")
+    session.drgn_session.start = drgn_start
+    
+    events = []
+    session.start(timeout=5, on_progress=lambda p, msg: events.append((p, msg, threading.current_thread())))
+    
+    assert (50.0, "drgn begin") in [(p, m) for p, m, _ in events]
+    assert (90.0, "drgn end") in [(p, m) for p, m, _ in events]
+    assert all(t is threading.current_thread() for _, _, t in events)
+    progress = [p for p, _, _ in events]
+    assert progress == sorted(progress)